@@ -1,14 +1,31 @@
 import dash
 from dash import html, dcc, page_container
 
+from utils import calentamiento, metricas, paginas, perfilador
+
 app = dash.Dash(
     __name__,
     use_pages=True,
+    pages_folder="",                    # las registra utils/paginas (importación perezosa)
     suppress_callback_exceptions=True   # <<< AGREGA ESTO
 )
 
 server = app.server
 
+# metadatos de pages/*.py sin importarlas; cada página se importa en su primera visita
+paginas.registrar(app)
+
+# las páginas arrancan con data/paises.json; las APIs se consultan en segundo
+# plano desde el primer request de cada worker
+calentamiento.registrar_ready(server)
+calentamiento.registrar(server)
+
+# latencia/bytes por callback y tiempo en APIs externas, en GET /metrics
+metricas.registrar(app)
+
+# cProfile de callbacks bajo demanda (TM_PERFIL_TOKEN / TM_PERFIL_MUESTREO)
+perfilador.registrar(server)
+
 app.layout = html.Div(className='app-container', children=[
     html.Div(className='app-header', children=[
         html.H1("Técnicas de Modelamiento Matemático")
@@ -19,6 +36,7 @@ app.layout = html.Div(className='app-container', children=[
             dcc.Link(
                 page["name"],
                 href=page["relative_path"],
+                refresh=paginas.PEREZOSAS,   # ver utils/paginas.py
                 style={
                     "backgroundColor": "#b35c5c",
                     "padding": "6px 14px",
@@ -0,0 +1,73 @@
+// assets/js/logistica.js
+// Modelo logístico evaluado en el navegador (páginas Capacidad de Carga y
+// Modelo con llamado). La figura que llega del servidor en el layout trae
+// todo el estilo; aquí sólo se recalculan x/y de sus trazas.
+(function () {
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        logistica: {
+            // P(t) = K P0 e^(rt) / (K + P0 (e^(rt) - 1)), 20 puntos (figura_capacidad)
+            capacidad: function (n_clicks, p0, r, k, tMax, figura) {
+                if (!valido(p0, r, k, tMax) || !figura) {
+                    return window.dash_clientside.no_update;
+                }
+                var t = linspace(0, tMax, 20);
+                var P = t.map(function (ti) {
+                    var e = Math.exp(r * ti);
+                    return (k * p0 * e) / (k + p0 * (e - 1));
+                });
+                return conDatos(figura, [
+                    {x: t, y: P},
+                    {x: [0, tMax], y: [k, k]}
+                ]);
+            },
+
+            // P(t) = K / (1 + ((K - P0) / P0) e^(-rt)), 100 puntos y marcadores
+            // cada 5 (grafica_logistica)
+            llamado: function (n_clicks, p0, r, k, tMax, figura) {
+                if (!valido(p0, r, k, tMax) || !figura) {
+                    return window.dash_clientside.no_update;
+                }
+                var t = linspace(0, tMax, 100);
+                var P = t.map(function (ti) {
+                    return k / (1 + ((k - p0) / p0) * Math.exp(-r * ti));
+                });
+                var tm = [], Pm = [];
+                for (var i = 0; i < t.length; i += 5) {
+                    tm.push(t[i]);
+                    Pm.push(P[i]);
+                }
+                return conDatos(figura, [
+                    {x: t, y: P},
+                    {x: tm, y: Pm},
+                    {x: [0, tMax], y: [k, k]}
+                ]);
+            }
+        }
+    });
+
+    function valido() {
+        for (var i = 0; i < arguments.length; i++) {
+            if (typeof arguments[i] !== "number" || !isFinite(arguments[i])) {
+                return false;
+            }
+        }
+        return arguments[0] !== 0;  // P0 = 0 divide por cero
+    }
+
+    function linspace(a, b, n) {
+        var paso = (b - a) / (n - 1);
+        var valores = new Array(n);
+        for (var i = 0; i < n; i++) {
+            valores[i] = a + i * paso;
+        }
+        return valores;
+    }
+
+    // Copia de la figura con x/y nuevos (objetos nuevos para que Plotly redibuje)
+    function conDatos(figura, series) {
+        var data = figura.data.map(function (traza, i) {
+            return Object.assign({}, traza, series[i]);
+        });
+        return Object.assign({}, figura, {data: data});
+    }
+})();
@@ -0,0 +1,128 @@
+# benchmarks/casos.py
+"""
+Casos de benchmark. Cada caso es (nombre, preparar, ejecutar): `preparar()`
+se corre antes de cada repetición (fuera del tiempo medido) y deja las cachés
+en el estado que el caso quiere medir (frío/caliente); `ejecutar()` devuelve
+lo que se mandaría al navegador, para medir también su tamaño.
+
+Se importa después de que run.py apunte las URLs al servidor de fixtures.
+"""
+import types
+
+import dash
+import numpy as np
+
+# las páginas llaman a dash.register_page al importarse
+_app = dash.Dash(__name__, use_pages=True, pages_folder="")
+
+from utils import almacen, campos, funciones  # noqa: E402
+from utils.paises import registro  # noqa: E402
+import pages.sir as pagina_sir  # noqa: E402
+import pages.seir as pagina_seir  # noqa: E402
+import pages.proyecto as pagina_proyecto  # noqa: E402
+import pages.modelo_sir_rumor as pagina_rumor  # noqa: E402
+import pages.comparacion_de_las_curvas as pagina_comparacion  # noqa: E402
+import pages.campovectorial as pagina_campo  # noqa: E402
+import pages.covid as pagina_covid  # noqa: E402
+import pages.clima as pagina_clima  # noqa: E402
+
+CASOS = []
+
+
+def caso(nombre, preparar=None):
+    def registrar(ejecutar):
+        CASOS.append((nombre, preparar or (lambda: None), ejecutar))
+        return ejecutar
+    return registrar
+
+
+# ============================================================
+# Estado de las cachés
+# ============================================================
+def _borrar_almacen():
+    for sufijo in ("", "-wal", "-shm"):
+        almacen.RUTA_BD.with_name(almacen.RUTA_BD.name + sufijo).unlink(missing_ok=True)
+
+
+def _frio_covid():
+    _borrar_almacen()
+    funciones._snapshot_global.update(datos=None, hora=0.0)
+
+
+def _frio_clima():
+    _borrar_almacen()
+    funciones._clima_memoria.clear()
+    funciones._temperaturas.clear()
+
+
+def _frio_campo():
+    campos.compilar_expresion.cache_clear()
+    campos.evaluar_campo.cache_clear()
+    campos.calcular_trayectorias.cache_clear()
+
+
+# ============================================================
+# Constructores de figuras (utils/funciones.py)
+# ============================================================
+_t = np.linspace(0, 100, 500)
+_S, _I, _R = 1000 * np.exp(-_t / 30), 300 * np.exp(-((_t - 30) / 12) ** 2), 1000 * (1 - np.exp(-_t / 30))
+_E = 0.5 * _I
+
+# datos de entrada descargados una vez del servidor de fixtures (fuera del tiempo medido)
+_DF_COVID = funciones._descargar_datos_covid("Peru")
+_DF_GLOBAL = funciones._descargar_snapshot_global()["df"]
+_DF_CLIMA = funciones._descargar_clima(-10.0, -76.0)
+_TABLA_TEMPERATURAS = funciones.temperaturas_actuales(registro().tabla())
+
+caso("constructor.grafica_logistica")(lambda: funciones.grafica_logistica(200, 0.04, 750, 100))
+caso("constructor.grafica_sir")(lambda: funciones.grafica_sir(_t, _S, _I, _R, 100))
+caso("constructor.grafica_seir")(lambda: funciones.grafica_seir(_t, _S, _E, _I, _R))
+caso("constructor.figura_lineal_covid")(lambda: funciones.figura_lineal_covid(_DF_COVID, "Peru"))
+caso("constructor.figura_lineal_covid.lttb")(
+    lambda: funciones.figura_lineal_covid(_DF_COVID, "Peru", max_puntos=225))
+caso("constructor.mapa_covid")(lambda: funciones._construir_mapa_covid(_DF_GLOBAL))
+caso("constructor.clima_line_plot")(lambda: funciones.clima_line_plot(_DF_CLIMA, "Peru"))
+caso("constructor.clima_world_map")(lambda: funciones.clima_world_map(_TABLA_TEMPERATURAS))
+
+
+# ============================================================
+# Solvers de las páginas (sin caché de figuras ni snapshots)
+# ============================================================
+caso("solver.sir")(lambda: pagina_sir.figura_sir.__wrapped__(1000, 0.3, 0.1, 1, 100))
+caso("solver.seir")(lambda: pagina_seir.figura_seir.__wrapped__(1000, 0.3, 0.1, 0.2, 1, 0, 100))
+caso("solver.proyecto")(pagina_proyecto.construir_figuras)
+caso("solver.rumor")(pagina_rumor.construir_figuras)
+caso("solver.comparacion")(pagina_comparacion.construir_figuras)
+caso("callback.sir.cache", preparar=lambda: pagina_sir.figura_sir(1000, 0.3, 0.1, 1, 100))(
+    lambda: pagina_sir.update_sir_graph(1, 1000, 0.3, 0.1, 1, 100))
+
+
+# ============================================================
+# Campo vectorial: mallado creciente
+# ============================================================
+pagina_campo.ctx = types.SimpleNamespace(triggered_id="btn-generar-campo")
+
+for _mallado in (10, 20, 40, 80):
+    caso(f"campo.flechas.mallado_{_mallado}", preparar=_frio_campo)(
+        lambda m=_mallado: pagina_campo.update_vector_field(1, "-y", "x - 0.1*y", None, 3, 3, m))
+
+caso("campo.trayectorias.200", preparar=_frio_campo)(
+    lambda: pagina_campo.update_vector_field(1, "-y", "x - 0.1*y", None, 3, 3, 20, "trayectorias", 200, 20))
+
+
+# ============================================================
+# Callbacks con APIs (contra el servidor de fixtures)
+# ============================================================
+caso("callback.covid.dashboard.frio", preparar=_frio_covid)(
+    lambda: pagina_covid.actualizar_dashboard(1, 900, "Peru", "all"))
+caso("callback.covid.dashboard.caliente")(
+    lambda: pagina_covid.actualizar_dashboard(1, 900, "Peru", "all"))
+caso("callback.covid.zoom")(
+    lambda: pagina_covid.detalle_zoom({"xaxis.range[0]": "2021-01-01", "xaxis.range[1]": "2021-06-30"},
+                                      900, "Peru", "all"))
+caso("callback.covid.mapa.frio", preparar=_frio_covid)(lambda: pagina_covid.actualizar_mapa(1))
+caso("callback.covid.mapa.caliente")(lambda: pagina_covid.actualizar_mapa(1))
+caso("callback.clima.linea.frio", preparar=_frio_clima)(lambda: pagina_clima.update_line("Peru", 1))
+caso("callback.clima.linea.caliente")(lambda: pagina_clima.update_line("Peru", 1))
+caso("callback.clima.mapa.frio", preparar=_frio_clima)(lambda: pagina_clima.update_mapa(1))
+caso("callback.clima.mapa.caliente")(lambda: pagina_clima.update_mapa(1))
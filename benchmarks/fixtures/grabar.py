@@ -0,0 +1,36 @@
+# benchmarks/fixtures/grabar.py
+"""
+Vuelve a grabar las respuestas de las APIs reales (requiere red):
+
+    python -m benchmarks.fixtures.grabar
+
+Tras grabar conviene regenerar la línea base (python -m benchmarks.run --guardar),
+porque los tamaños de las respuestas cambian.
+"""
+import json
+from pathlib import Path
+
+import requests
+
+DIRECTORIO = Path(__file__).resolve().parent
+
+GRABACIONES = {
+    "covid_historico": "https://disease.sh/v3/covid-19/historical/Peru?lastdays=all",
+    "covid_paises": "https://disease.sh/v3/covid-19/countries",
+    "restcountries": "https://restcountries.com/v3.1/all?fields=name,cca2,cca3,latlng",
+    "open_meteo_forecast": "https://api.open-meteo.com/v1/forecast?latitude=-10.0&longitude=-76.0&hourly=temperature_2m",
+}
+
+
+def main():
+    for nombre, url in GRABACIONES.items():
+        r = requests.get(url, timeout=30)
+        r.raise_for_status()
+        (DIRECTORIO / f"{nombre}.json").write_text(
+            json.dumps(r.json(), ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+        )
+        print(f"{nombre}: {len(r.content):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# benchmarks/run.py
+"""
+Benchmarks de constructores de figuras, solvers y callbacks.
+
+    python -m benchmarks.run                  # corre todo y compara con baseline.json
+    python -m benchmarks.run -k covid         # sólo casos cuyo nombre contiene "covid"
+    python -m benchmarks.run --guardar        # reescribe la línea base con esta corrida
+    python -m benchmarks.run --tiempos        # también falla si un caso es más lento
+
+Por caso se informa la mediana de tiempo de pared, el pico de memoria
+asignada (tracemalloc) y los bytes de la respuesta tal como la serializa
+Dash. Las APIs externas se sirven desde benchmarks/fixtures/ en un servidor
+local y el SQLite/snapshots van a un directorio temporal, así la corrida es
+reproducible y no toca .cache/.
+
+Sale con código 1 si cambió el tamaño de la respuesta de algún caso. Los
+tiempos se comparan por el mínimo de las repeticiones (el menos afectado por
+ruido) y sólo se informan: la línea base es de una máquina concreta. Con
+--tiempos también hacen fallar la corrida (útil en una máquina dedicada).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+RUTA_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _preparar_entorno():
+    """URLs al servidor de fixtures y cachés en un directorio temporal (antes de importar utils)."""
+    from benchmarks import servidor
+
+    base = servidor.iniciar()
+    temporal = Path(tempfile.mkdtemp(prefix="tm-bench-"))
+    os.environ.update({
+        "TM_DISEASE_SH_URL": base,
+        "TM_RESTCOUNTRIES_URL": base,
+        "TM_OPEN_METEO_URL": base,
+        "TM_DATA_DB": str(temporal / "datos.sqlite3"),
+        "TM_SNAPSHOT_DIR": str(temporal / "figuras"),
+        "TM_PAISES_JSON": str(temporal / "paises.json"),
+    })
+
+
+def _bytes_respuesta(resultado):
+    from dash._utils import to_json
+
+    if isinstance(resultado, tuple):
+        resultado = list(resultado)
+    return len(to_json(resultado).encode("utf-8"))
+
+
+def medir(preparar, ejecutar, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        preparar()
+        inicio = time.perf_counter()
+        resultado = ejecutar()
+        tiempos.append(time.perf_counter() - inicio)
+
+    # una corrida aparte para memoria: tracemalloc frena la ejecución
+    preparar()
+    tracemalloc.start()
+    ejecutar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mediana_ms": round(statistics.median(tiempos) * 1000, 3),
+        "min_ms": round(min(tiempos) * 1000, 3),
+        "pico_kib": round(pico / 1024, 1),
+        "bytes": _bytes_respuesta(resultado),
+    }
+
+
+def comparar(nombre, actual, base, tolerancia):
+    """(avisos de tiempo, avisos de tamaño) del caso respecto a la línea base."""
+    if base is None:
+        return [], []
+
+    tiempos, tamanos = [], []
+    if actual["min_ms"] > base["min_ms"] * (1 + tolerancia):
+        tiempos.append(f"{nombre}: mínimo {base['min_ms']:.2f} -> {actual['min_ms']:.2f} ms")
+    if actual["bytes"] != base["bytes"]:
+        tamanos.append(f"{nombre}: respuesta {base['bytes']:,} -> {actual['bytes']:,} bytes")
+    return tiempos, tamanos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filtro", default="", help="sólo casos cuyo nombre contiene este texto")
+    parser.add_argument("-n", dest="repeticiones", type=int, default=5, help="repeticiones por caso (5)")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="margen del tiempo mínimo sobre la línea base antes de avisar (0.5 = 50%%)")
+    parser.add_argument("--tiempos", action="store_true",
+                        help="las regresiones de tiempo también hacen fallar la corrida")
+    parser.add_argument("--guardar", action="store_true", help="guardar esta corrida como línea base")
+    args = parser.parse_args(argv)
+
+    _preparar_entorno()
+    from benchmarks.casos import CASOS
+
+    baseline = json.loads(RUTA_BASELINE.read_text(encoding="utf-8")) if RUTA_BASELINE.exists() else {}
+    casos_base = baseline.get("casos", {})
+
+    resultados, avisos_tiempo, avisos_tamano = {}, [], []
+    print(f"{'caso':42s} {'mediana ms':>11s} {'min ms':>9s} {'pico KiB':>9s} {'bytes':>9s}  min vs base")
+    for nombre, preparar, ejecutar in CASOS:
+        if args.filtro not in nombre:
+            continue
+
+        r = medir(preparar, ejecutar, args.repeticiones)
+        resultados[nombre] = r
+
+        base = casos_base.get(nombre)
+        relativo = f"{r['min_ms'] / base['min_ms']:6.2f}x" if base and base["min_ms"] else "     -"
+        print(f"{nombre:42s} {r['mediana_ms']:11.2f} {r['min_ms']:9.2f} {r['pico_kib']:9.1f} {r['bytes']:9,d}  {relativo}")
+
+        tiempos, tamanos = comparar(nombre, r, base, args.tolerancia)
+        avisos_tiempo += tiempos
+        avisos_tamano += tamanos
+
+    if args.guardar:
+        # sólo se reemplazan los casos corridos (respeta -k)
+        casos_base.update(resultados)
+        RUTA_BASELINE.write_text(json.dumps({
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "repeticiones": args.repeticiones,
+            "casos": dict(sorted(casos_base.items())),
+        }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nLínea base guardada en {RUTA_BASELINE}")
+        return 0
+
+    if avisos_tiempo:
+        print("\nMás lentos que la línea base" + ("" if args.tiempos else " (sólo aviso; --tiempos para fallar)") + ":")
+        for aviso in avisos_tiempo:
+            print(f"  - {aviso}")
+
+    if avisos_tamano:
+        print("\nCambió el tamaño de la respuesta:")
+        for aviso in avisos_tamano:
+            print(f"  - {aviso}")
+
+    return 1 if avisos_tamano or (args.tiempos and avisos_tiempo) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# benchmarks/servidor.py
+"""
+Servidor HTTP local que responde como disease.sh, RESTCountries y Open-Meteo
+con las respuestas grabadas en benchmarks/fixtures/ (ver grabar.py).
+
+Las páginas se apuntan a él con TM_DISEASE_SH_URL, TM_RESTCOUNTRIES_URL y
+TM_OPEN_METEO_URL, así los callbacks se miden sin depender de la red.
+"""
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def _cargar(nombre):
+    return json.loads((FIXTURES / nombre).read_text(encoding="utf-8"))
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    datos = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        consulta = parse_qs(url.query)
+
+        if url.path.startswith("/v3/covid-19/historical/"):
+            cuerpo = self._historico(consulta.get("lastdays", ["all"])[0])
+        elif url.path == "/v3/covid-19/countries":
+            cuerpo = self.datos["covid_paises"]
+        elif url.path == "/v3.1/all":
+            cuerpo = self.datos["restcountries"]
+        elif url.path == "/v1/forecast" and "current" in consulta:
+            cuerpo = self._actual(consulta)
+        elif url.path == "/v1/forecast":
+            cuerpo = self.datos["open_meteo_forecast"]
+        else:
+            self._responder(404, b"{}")
+            return
+
+        self._responder(200, json.dumps(cuerpo).encode("utf-8"))
+
+    def _historico(self, lastdays):
+        historico = self.datos["covid_historico"]
+        if lastdays == "all":
+            return historico
+
+        n = int(lastdays)
+        return {
+            **historico,
+            "timeline": {
+                serie: dict(list(valores.items())[-n:])
+                for serie, valores in historico["timeline"].items()
+            }
+        }
+
+    def _actual(self, consulta):
+        # una entrada por coordenada, como la API real con listas lat/lon
+        latitudes = consulta["latitude"][0].split(",")
+        longitudes = consulta["longitude"][0].split(",")
+        entradas = [
+            {"latitude": float(lat), "longitude": float(lon),
+             "current": {"time": "2026-10-17T12:00", "temperature_2m": round(28 - abs(float(lat)) * 0.45, 1)}}
+            for lat, lon in zip(latitudes, longitudes)
+        ]
+        return entradas[0] if len(entradas) == 1 else entradas
+
+    def _responder(self, estado, cuerpo):
+        self.send_response(estado)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            cuerpo = gzip.compress(cuerpo)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def iniciar():
+    """Arranca el servidor en un puerto libre (hilo daemon) y devuelve su URL base."""
+    _Manejador.datos = {
+        nombre: _cargar(f"{nombre}.json")
+        for nombre in ("covid_historico", "covid_paises", "restcountries", "open_meteo_forecast")
+    }
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Manejador)
+    threading.Thread(target=servidor.serve_forever, name="fixtures", daemon=True).start()
+    return f"http://127.0.0.1:{servidor.server_port}"
@@ -0,0 +1,2 @@
+# conftest.py
+# Vacío a propósito: pytest agrega esta carpeta a sys.path y los tests importan utils.*
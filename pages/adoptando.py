@@ -2,7 +2,9 @@ import dash
 from dash import html, dcc
 import plotly.graph_objects as go
 import numpy as np
-from scipy.integrate import odeint
+
+from utils.modelos import resolver_sir_ensamble
+from utils.snapshots import snapshot
 
 dash.register_page(
     __name__,
@@ -20,17 +22,6 @@ COLOR_FONDO_GRAFICO = '#ffffff'
 COLOR_FONDO_PAPEL = '#ffffff'
 COLOR_GRID = '#cccccc'
 
-# --------------------------
-# 📌 MODELO SIR
-# --------------------------
-def modelo_sir(y, t, b, g):
-    S, I, R = y
-    return [
-        -b * S * I,
-        b * S * I - g * I,
-        g * I
-    ]
-
 # --------------------------
 # 📌 PARÁMETROS
 # --------------------------
@@ -44,16 +35,6 @@ gamma_base = 0.25
 R0_base = 2.5
 beta_base = R0_base * gamma_base / N
 
-# --------------------------
-# 📌 CURVAS
-# --------------------------
-def calcular_curva(beta, gamma):
-    sol = odeint(modelo_sir, y0, t, args=(beta, gamma))
-    return sol[:, 2]
-
-R1 = calcular_curva(beta_base, gamma_base)
-R2 = calcular_curva(beta_base * 2, gamma_base)
-R3 = calcular_curva(beta_base, gamma_base * 2)
 
 # --------------------------
 # 📌 GRÁFICOS
@@ -98,81 +79,96 @@ def crear_grafico_adopters(tiempo, datos_r, titulo, y_max=None):
     fig.update_yaxes(yaxis_cfg)
     return fig
 
-# Figuras
-fig_base = crear_grafico_adopters(t, R1, "R(t) - baseline", y_max=9500)
-fig_b_double = crear_grafico_adopters(t, R2, "R(t) - β doble", y_max=10200)
-fig_k_double = crear_grafico_adopters(t, R3, "R(t) - γ doble", y_max=4000)
+# --------------------------
+# 📌 CURVAS + FIGURAS (sólo al primer acceso)
+# --------------------------
+def construir_figuras():
+    sol = resolver_sir_ensamble(
+        [beta_base, beta_base * 2, beta_base],
+        [gamma_base, gamma_base, gamma_base * 2],
+        y0, t
+    )
+    R1, R2, R3 = sol[:, 2]
+
+    return {
+        "base": crear_grafico_adopters(t, R1, "R(t) - baseline", y_max=9500),
+        "b_double": crear_grafico_adopters(t, R2, "R(t) - β doble", y_max=10200),
+        "k_double": crear_grafico_adopters(t, R3, "R(t) - γ doble", y_max=4000),
+    }
 
 # --------------------------
 # 📌 LAYOUT (LIGHT)
 # --------------------------
-layout = html.Div([
-
-    html.H1("Adoptantes Pasivos R(t): Acumulados",
-            style={
-                'textAlign': 'center',
-                'color': COLOR_TITULO,
-                'paddingBottom': '20px',
-                'fontSize': '26px'
-            }),
+def layout(**kwargs):
+    figuras = snapshot("adoptando", construir_figuras)
 
-    # Contenedor
-    html.Div([
+    return html.Div([
 
-        # Fila 1
+        html.H1("Adoptantes Pasivos R(t): Acumulados",
+                style={
+                    'textAlign': 'center',
+                    'color': COLOR_TITULO,
+                    'paddingBottom': '20px',
+                    'fontSize': '26px'
+                }),
+
+        # Contenedor
         html.Div([
-            html.Div(
-                dcc.Graph(figure=fig_base, config={'displayModeBar': False}),
-                style={'flex': '1', 'minWidth': '300px', 'padding': '10px'}
-            ),
 
-            html.Div(
-                dcc.Graph(figure=fig_b_double, config={'displayModeBar': False}),
-                style={'flex': '1', 'minWidth': '300px', 'padding': '10px'}
-            ),
+            # Fila 1
+            html.Div([
+                html.Div(
+                    dcc.Graph(figure=figuras["base"], config={'displayModeBar': False}),
+                    style={'flex': '1', 'minWidth': '300px', 'padding': '10px'}
+                ),
+
+                html.Div(
+                    dcc.Graph(figure=figuras["b_double"], config={'displayModeBar': False}),
+                    style={'flex': '1', 'minWidth': '300px', 'padding': '10px'}
+                ),
+
+            ], style={
+                'display': 'flex',
+                'flexWrap': 'wrap',
+                'justifyContent': 'center',
+                'width': '100%'
+            }),
+
+            # Fila 2
+            html.Div([
+                html.Div(
+                    dcc.Graph(figure=figuras["k_double"], config={'displayModeBar': False}),
+                    style={'width': '60%', 'minWidth': '300px',
+                           'margin': '0 auto', 'padding': '10px'}
+                )
+            ])
 
         ], style={
-            'display': 'flex',
-            'flexWrap': 'wrap',
-            'justifyContent': 'center',
-            'width': '100%'
+            'backgroundColor': '#ffffff',
+            'borderRadius': '10px',
+            'padding': '20px',
+            'border': '1px solid #ddd'
         }),
 
-        # Fila 2
+        # Interpretación
         html.Div([
-            html.Div(
-                dcc.Graph(figure=fig_k_double, config={'displayModeBar': False}),
-                style={'width': '60%', 'minWidth': '300px',
-                       'margin': '0 auto', 'padding': '10px'}
-            )
-        ])
-
-    ], style={
-        'backgroundColor': '#ffffff',
-        'borderRadius': '10px',
-        'padding': '20px',
-        'border': '1px solid #ddd'
-    }),
-
-    # Interpretación
-    html.Div([
-        html.H4("Interpretación: Acumulación de Adoptantes",
-                style={'color': COLOR_LINEA_PRINCIPAL}),
-
-        dcc.Markdown(r'''
-Los gráficos muestran el número acumulado de **Adoptantes Pasivos** $R(t)$:
-
-1. **Baseline:** Crecimiento estándar, ~90% de adopción.
-2. **β doble:** La adopción se acelera llegando casi al 100%.
-3. **γ doble:** Aumenta la “recuperación” → solo ~3700 adoptantes.
-        ''', mathjax=True, style={'color': '#333'})
+            html.H4("Interpretación: Acumulación de Adoptantes",
+                    style={'color': COLOR_LINEA_PRINCIPAL}),
+
+            dcc.Markdown(r'''
+    Los gráficos muestran el número acumulado de **Adoptantes Pasivos** $R(t)$:
+
+    1. **Baseline:** Crecimiento estándar, ~90% de adopción.
+    2. **β doble:** La adopción se acelera llegando casi al 100%.
+    3. **γ doble:** Aumenta la “recuperación” → solo ~3700 adoptantes.
+            ''', mathjax=True, style={'color': '#333'})
+        ],
+            style={'marginTop': '30px', 'maxWidth': '800px',
+                   'marginLeft': 'auto', 'marginRight': 'auto'})
     ],
-        style={'marginTop': '30px', 'maxWidth': '800px',
-               'marginLeft': 'auto', 'marginRight': 'auto'})
-],
-    style={
-        'backgroundColor': '#f7f7f7',
-        'minHeight': '100vh',
-        'padding': '20px',
-        'fontFamily': 'sans-serif'
-    })
+        style={
+            'backgroundColor': '#f7f7f7',
+            'minHeight': '100vh',
+            'padding': '20px',
+            'fontFamily': 'sans-serif'
+        })
@@ -1,7 +1,16 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, ctx
 import plotly.graph_objects as go
-import numpy as np
+
+from utils.campos import (
+    evaluar_campo,
+    ventana_desde_relayout,
+    figura_campo,
+    calcular_trayectorias,
+    figura_trayectorias,
+    MAX_SEMILLAS,
+    MAX_MALLADO
+)
 
 dash.register_page(__name__, path="/campovectorial", name="Campo Vectorial")
 
@@ -32,10 +41,10 @@ layout = html.Div(
             ),
 
             html.Label("dx/dt = f(x,y):", className='input-label'),
-            dcc.Input(id='input-dxdt', type='text', value='-y', className='input-field'),
+            dcc.Input(id='input-dxdt', type='text', value='-y', debounce=True, className='input-field'),
 
             html.Label("dy/dt = g(x,y):", className='input-label'),
-            dcc.Input(id='input-dydt', type='text', value='x', className='input-field'),
+            dcc.Input(id='input-dydt', type='text', value='x', debounce=True, className='input-field'),
 
             html.Label("Rango X (±):", className='input-label'),
             dcc.Input(id='input-range-x', type='number', value=3, className='input-field'),
@@ -44,7 +53,25 @@ layout = html.Div(
             dcc.Input(id='input-range-y', type='number', value=3, className='input-field'),
 
             html.Label("Mallado:", className='input-label'),
-            dcc.Input(id='input-mallado', type='number', value=20, className='input-field'),
+            dcc.Input(id='input-mallado', type='number', value=20, min=5, max=MAX_MALLADO, className='input-field'),
+
+            html.Label("Modo:", className='input-label'),
+            dcc.RadioItems(
+                id='radio-modo-campo',
+                options=[
+                    {"label": "Flechas", "value": "flechas"},
+                    {"label": "Trayectorias", "value": "trayectorias"},
+                ],
+                value="flechas",
+                inline=True,
+                className='input-field'
+            ),
+
+            html.Label("Semillas (trayectorias):", className='input-label'),
+            dcc.Input(id='input-semillas', type='number', value=200, min=4, max=MAX_SEMILLAS, className='input-field'),
+
+            html.Label("Tiempo de integración:", className='input-label'),
+            dcc.Input(id='input-tiempo-tray', type='number', value=20, className='input-field'),
 
             html.Button("Generar Campo", id="btn-generar-campo", n_clicks=0, className="btn-generar"),
         ]),
@@ -103,64 +130,53 @@ def cargar_ejemplo(ejemplo):
     Input('btn-generar-campo', 'n_clicks'),
     Input('input-dxdt', 'value'),
     Input('input-dydt', 'value'),
+    Input('graph-campo-vectorial', 'relayoutData'),
     State('input-range-x', 'value'),
     State('input-range-y', 'value'),
     State('input-mallado', 'value'),
+    State('radio-modo-campo', 'value'),
+    State('input-semillas', 'value'),
+    State('input-tiempo-tray', 'value'),
 )
-def update_vector_field(n_clicks, eq_dxdt, eq_dydt, range_x, range_y, mallado):
-    """Genera el campo vectorial."""
+def update_vector_field(n_clicks, eq_dxdt, eq_dydt, relayout, range_x, range_y, mallado,
+                        modo="flechas", semillas=200, t_tray=20):
+    """Genera el campo vectorial (flechas de la vista actual) o sus trayectorias."""
     
     fig = go.Figure()
 
     if n_clicks == 0:
         return fig, ""
 
+    # Las trayectorias no dependen de la vista: un zoom/pan no se vuelve a integrar
+    # (plotly ya redibujó el gráfico; el uirevision conserva la vista)
+    if modo == "trayectorias" and ctx.triggered_id == 'graph-campo-vectorial':
+        raise dash.exceptions.PreventUpdate
+
     try:
         range_x = float(range_x)
         range_y = float(range_y)
-        mallado = max(5, int(mallado))
-
-        x_vals = np.linspace(-range_x, range_x, mallado)
-        y_vals = np.linspace(-range_y, range_y, mallado)
-        x, y = np.meshgrid(x_vals, y_vals)
-
-        safe = {
-            "np": np,
-            "x": x,
-            "y": y,
-            "sin": np.sin,
-            "cos": np.cos,
-            "exp": np.exp,
-            "sqrt": np.sqrt,
-            "log": np.log
-        }
-
-        u = eval(eq_dxdt, {"__builtins__": None}, safe)
-        v = eval(eq_dydt, {"__builtins__": None}, safe)
-
-        # Normalización
-        mag = np.sqrt(u**2 + v**2) + 1e-9
-        u_norm = u / mag
-        v_norm = v / mag
-
-        L = (range_x * 2 / mallado) * 0.4
-        x_end = x + u_norm * L
-        y_end = y + v_norm * L
-
-        XO, YO = [], []
-        for i in range(mallado):
-            for j in range(mallado):
-                XO += [x[i,j], x_end[i,j], None]
-                YO += [y[i,j], y_end[i,j], None]
-
-        fig.add_trace(go.Scatter(x=XO, y=YO, mode="lines", line=dict(width=1.2, color="blue")))
-        fig.add_trace(go.Scatter(x=x.flatten(), y=y.flatten(), mode="markers", marker=dict(size=2, color="red")))
-
-        fig.update_layout(
-            xaxis=dict(range=[-range_x, range_x], scaleanchor="y"),
-            yaxis=dict(range=[-range_y, range_y]),
-            plot_bgcolor="white"
-        )
+        mallado = min(max(5, int(mallado)), MAX_MALLADO)
+
+        # Modo trayectorias: todas las semillas integradas como un solo sistema
+        if modo == "trayectorias":
+            semillas = min(max(4, int(semillas)), MAX_SEMILLAS)
+            x0, y0, X, Y = calcular_trayectorias(eq_dxdt, eq_dydt, range_x, range_y,
+                                                 semillas, float(t_tray))
+            return figura_trayectorias(x0, y0, X, Y, range_x, range_y), ""
+
+        # Al hacer zoom/pan se redibuja sólo la ventana visible, con más detalle
+        ventana = None
+        if ctx.triggered_id == 'graph-campo-vectorial':
+            ventana = ventana_desde_relayout(relayout)
+
+        # Expresiones validadas y compiladas una vez; campo memorizado
+        x_vals, y_vals, x, y, u, v = evaluar_campo(eq_dxdt, eq_dydt, range_x, range_y, mallado, ventana)
+
+        # Largo de flecha según la separación de los puntos dibujados
+        separacion = x_vals[1] - x_vals[0] if len(x_vals) > 1 else range_x * 2 / mallado
+        L = separacion * 0.4
+
+        fig = figura_campo(x, y, u, v, L, range_x, range_y, ventana)
 
         return fig, ""
 
@@ -1,8 +1,11 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, Input, Output, State, callback, clientside_callback, ClientsideFunction
 import numpy as np
 import plotly.graph_objs as go
 
+from utils.cache import cache_figura
+from utils.funciones import LOGISTICA_EN_NAVEGADOR
+
 # ---------------------------------------------
 # REGISTRO DE LA PÁGINA
 # ---------------------------------------------
@@ -13,81 +16,105 @@ dash.register_page(
 )
 
 # ------------------------
-# Layout
-layout = html.Div(
-    className="contenedor-principal",
-    children=[
-
-        # Contenedor izquierdo
-        html.Div(
-            className="contenedor-izquierdo",
-            children=[
-                html.H2("Parámetros del modelo", className="titulo"),
-
-                html.Div([
-                    html.Label("Población inicial (P₀):"),
-                    dcc.Input(
-                        id="input-p0", type="number", value=200,
-                        min=1, step=1, className="input-field"
-                    ),
-                ]),
-                html.Div([
-                    html.Label("Tasa de crecimiento (r):"),
-                    dcc.Input(
-                        id="input-r", type="number", value=0.04,
-                        min=0, step=0.01, className="input-field"
-                    ),
-                ]),
-                html.Div([
-                    html.Label("Capacidad de carga (K):"),
-                    dcc.Input(
-                        id="input-k", type="number", value=1000,
-                        min=1, step=1, className="input-field"
-                    ),
-                ]),
-                html.Div([
-                    html.Label("Tiempo máximo (t):"),
-                    dcc.Input(
-                        id="input-t", type="number", value=100,
-                        min=1, step=1, className="input-field"
+# Layout (función: la figura inicial se arma en la primera visita y queda en caché)
+def layout(**kwargs):
+    return html.Div(
+        className="contenedor-principal",
+        children=[
+
+            # Contenedor izquierdo
+            html.Div(
+                className="contenedor-izquierdo",
+                children=[
+                    html.H2("Parámetros del modelo", className="titulo"),
+
+                    html.Div([
+                        html.Label("Población inicial (P₀):"),
+                        dcc.Input(
+                            id="input-p0", type="number", value=200,
+                            min=1, step=1, className="input-field"
+                        ),
+                    ]),
+                    html.Div([
+                        html.Label("Tasa de crecimiento (r):"),
+                        dcc.Input(
+                            id="input-r", type="number", value=0.04,
+                            min=0, step=0.01, className="input-field"
+                        ),
+                    ]),
+                    html.Div([
+                        html.Label("Capacidad de carga (K):"),
+                        dcc.Input(
+                            id="input-k", type="number", value=1000,
+                            min=1, step=1, className="input-field"
+                        ),
+                    ]),
+                    html.Div([
+                        html.Label("Tiempo máximo (t):"),
+                        dcc.Input(
+                            id="input-t", type="number", value=100,
+                            min=1, step=1, className="input-field"
+                        ),
+                    ]),
+                    html.Button(
+                        "Generar gráfico",
+                        id="btn-generar",
+                        n_clicks=0,
+                        className="btn-generar"
                     ),
-                ]),
-                html.Button(
-                    "Generar gráfico",
-                    id="btn-generar",
-                    n_clicks=0,
-                    className="btn-generar"
-                ),
-            ]
-        ),
+                ]
+            ),
 
-        # Contenedor derecho
-        html.Div(
-            className="contenedor-derecho",
-            children=[
-                html.H3("Gráfico de crecimiento poblacional",
-                        style={"textAlign": "center", "color": "#d0021b"}),
-                dcc.Graph(
-                    id="grafica-poblacion",
-                    style={"height": "420px", "width": "100%"}
-                )
-            ]
-        )
-    ]
-)
+            # Contenedor derecho
+            html.Div(
+                className="contenedor-derecho",
+                children=[
+                    html.H3("Gráfico de crecimiento poblacional",
+                            style={"textAlign": "center", "color": "#d0021b"}),
+                    dcc.Graph(
+                        id="grafica-poblacion",
+                        # figura inicial con todo el estilo (el navegador sólo cambia los datos)
+                        figure=figura_capacidad(200, 0.04, 1000, 100),
+                        style={"height": "420px", "width": "100%"}
+                    )
+                ]
+            )
+        ]
+    )
 
 # ------------------------
 # Callback
-@callback(
-    Output("grafica-poblacion", "figure"),
-    Input("btn-generar", "n_clicks"),
-    State("input-p0", "value"),
-    State("input-r", "value"),
-    State("input-k", "value"),
-    State("input-t", "value"),
-    prevent_initial_call=False
-)
 def actualizar_grafico(n_clicks, P0, r, K, t_max):
+    return figura_capacidad(P0, r, K, t_max)
+
+
+if LOGISTICA_EN_NAVEGADOR:
+    # Fórmula cerrada: se evalúa en el navegador sin ir al servidor
+    clientside_callback(
+        ClientsideFunction(namespace="logistica", function_name="capacidad"),
+        Output("grafica-poblacion", "figure"),
+        Input("btn-generar", "n_clicks"),
+        State("input-p0", "value"),
+        State("input-r", "value"),
+        State("input-k", "value"),
+        State("input-t", "value"),
+        State("grafica-poblacion", "figure"),
+        prevent_initial_call=True
+    )
+else:
+    callback(
+        Output("grafica-poblacion", "figure"),
+        Input("btn-generar", "n_clicks"),
+        State("input-p0", "value"),
+        State("input-r", "value"),
+        State("input-k", "value"),
+        State("input-t", "value"),
+        prevent_initial_call=True
+    )(actualizar_grafico)
+
+
+@cache_figura(maxsize=256)
+def figura_capacidad(P0, r, K, t_max):
     # Generar los valores del tiempo
     t = np.linspace(0, t_max, 20)
 
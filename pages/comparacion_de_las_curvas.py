@@ -2,7 +2,9 @@ import dash
 from dash import html, dcc
 import plotly.graph_objects as go
 import numpy as np
-from scipy.integrate import odeint
+
+from utils.modelos import resolver_sir_ensamble
+from utils.snapshots import snapshot
 
 dash.register_page(__name__, path="/comparacion_de_las_curvas", name="Comparación I(t)")
 
@@ -19,15 +21,6 @@ COLOR_BORDER = '#E0E0E0'
 COLOR_GRID = '#CCCCCC'
 
 
-# === MODELO SIR ===
-def modelo_sir(y, t, b, g):
-    S, I, R = y
-    dS_dt = -b * S * I
-    dI_dt = b * S * I - g * I
-    dR_dt = g * I
-    return [dS_dt, dI_dt, dR_dt]
-
-
 # === PARÁMETROS ===
 N = 10000.0
 I0 = 10.0
@@ -40,17 +33,8 @@ gamma_base = 0.25
 R0_base = 2.5
 beta_base = R0_base * gamma_base / N
 
-# === SOLUCIONES ===
-sol1 = odeint(modelo_sir, y0, t, args=(beta_base, gamma_base))
-I_base = sol1[:, 1]
-
 beta_double = beta_base * 2
-sol2 = odeint(modelo_sir, y0, t, args=(beta_double, gamma_base))
-I_beta = sol2[:, 1]
-
 gamma_double = gamma_base * 2
-sol3 = odeint(modelo_sir, y0, t, args=(beta_base, gamma_double))
-I_gamma = sol3[:, 1]
 
 
 # === GRÁFICO COMPARATIVO ===
@@ -92,95 +76,108 @@ def crear_grafico_comparativo(tiempo, i_base, i_beta, i_gamma):
     return fig
 
 
-fig_comparacion = crear_grafico_comparativo(t, I_base, I_beta, I_gamma)
+# === SOLUCIONES (sólo al primer acceso) ===
+def construir_figuras():
+    # Los tres escenarios (baseline, β doble, γ doble) se integran juntos
+    sol = resolver_sir_ensamble(
+        [beta_base, beta_double, beta_base],
+        [gamma_base, gamma_base, gamma_double],
+        y0, t
+    )
+    I_base, I_beta, I_gamma = sol[:, 1]
+
+    return {"comparacion": crear_grafico_comparativo(t, I_base, I_beta, I_gamma)}
 
 
 # === LAYOUT EN TONOS CLAROS CON CONTENEDORES ===
-layout = html.Div([
-
-    # TÍTULO PRINCIPAL
-    html.H1("Comparación de Dinámicas de Difusión",
-            style={
-                'textAlign': 'center',
-                'color': COLOR_TITULO,
-                'fontSize': '32px',
-                'marginBottom': '25px'
-            }),
-
-    # ==============================
-    #      CONTENEDORES SEPARADOS
-    # ==============================
-
-    html.Div([
-        # COLUMNA IZQUIERDA – TEXTO
+def layout(**kwargs):
+    figuras = snapshot("comparacion", construir_figuras)
+
+    return html.Div([
+
+        # TÍTULO PRINCIPAL
+        html.H1("Comparación de Dinámicas de Difusión",
+                style={
+                    'textAlign': 'center',
+                    'color': COLOR_TITULO,
+                    'fontSize': '32px',
+                    'marginBottom': '25px'
+                }),
+
+        # ==============================
+        #      CONTENEDORES SEPARADOS
+        # ==============================
+
         html.Div([
+            # COLUMNA IZQUIERDA – TEXTO
             html.Div([
-                html.H3("Análisis Descriptivo de Parámetros",
-                        style={'color': COLOR_BASELINE, 'fontSize': '22px'}),
-
-                dcc.Markdown(r'''
-                Este estudio compara la dinámica temporal de los individuos en el estado
-                **Infectados / Promotores Activos** bajo tres configuraciones del modelo SIR.
-
-                **1. Baseline (Azul):**  
-                Escenario con parámetros originales.  
-                La curva presenta un pico estable cerca del día **25**.
-
-                **2. b_double (Naranja):**  
-                El parámetro de transmisión $\beta$ se duplica.  
-                Esto provoca una difusión **mucho más rápida y con un pico mayor**.
-
-                **3. k_double (Verde):**  
-                El parámetro de recuperación/desinterés $\gamma$ se duplica.  
-                La curva se vuelve **más plana**, con una reducción drástica del pico.
-                ''',
-                mathjax=True,
-                style={'color': COLOR_TEXTO, 'fontSize': '16px', 'lineHeight': '1.6'})
+                html.Div([
+                    html.H3("Análisis Descriptivo de Parámetros",
+                            style={'color': COLOR_BASELINE, 'fontSize': '22px'}),
+
+                    dcc.Markdown(r'''
+                    Este estudio compara la dinámica temporal de los individuos en el estado
+                    **Infectados / Promotores Activos** bajo tres configuraciones del modelo SIR.
+
+                    **1. Baseline (Azul):**  
+                    Escenario con parámetros originales.  
+                    La curva presenta un pico estable cerca del día **25**.
+
+                    **2. b_double (Naranja):**  
+                    El parámetro de transmisión $\beta$ se duplica.  
+                    Esto provoca una difusión **mucho más rápida y con un pico mayor**.
+
+                    **3. k_double (Verde):**  
+                    El parámetro de recuperación/desinterés $\gamma$ se duplica.  
+                    La curva se vuelve **más plana**, con una reducción drástica del pico.
+                    ''',
+                    mathjax=True,
+                    style={'color': COLOR_TEXTO, 'fontSize': '16px', 'lineHeight': '1.6'})
+                ],
+                style={
+                    'backgroundColor': COLOR_CONTAINER,
+                    'border': f'1px solid {COLOR_BORDER}',
+                    'borderRadius': '12px',
+                    'padding': '25px',
+                    'boxShadow': '0 2px 6px rgba(0,0,0,0.08)',
+                })
             ],
-            style={
-                'backgroundColor': COLOR_CONTAINER,
-                'border': f'1px solid {COLOR_BORDER}',
-                'borderRadius': '12px',
-                'padding': '25px',
-                'boxShadow': '0 2px 6px rgba(0,0,0,0.08)',
-            })
-        ],
-        style={'width': '45%'}),
+            style={'width': '45%'}),
 
-        # COLUMNA DERECHA – GRÁFICO
-        html.Div([
+            # COLUMNA DERECHA – GRÁFICO
             html.Div([
-                dcc.Graph(
-                    figure=fig_comparacion,
-                    config={'displayModeBar': False},
-                    style={'height': '430px'}
-                )
+                html.Div([
+                    dcc.Graph(
+                        figure=figuras["comparacion"],
+                        config={'displayModeBar': False},
+                        style={'height': '430px'}
+                    )
+                ],
+                style={
+                    'backgroundColor': COLOR_CONTAINER,
+                    'border': f'1px solid {COLOR_BORDER}',
+                    'borderRadius': '12px',
+                    'padding': '20px',
+                    'boxShadow': '0 2px 6px rgba(0,0,0,0.08)',
+                })
             ],
-            style={
-                'backgroundColor': COLOR_CONTAINER,
-                'border': f'1px solid {COLOR_BORDER}',
-                'borderRadius': '12px',
-                'padding': '20px',
-                'boxShadow': '0 2px 6px rgba(0,0,0,0.08)',
-            })
+            style={'width': '55%'}),
+
         ],
-        style={'width': '55%'}),
+        style={
+            'display': 'flex',
+            'flexDirection': 'row',
+            'justifyContent': 'space-between',
+            'alignItems': 'flex-start',
+            'gap': '25px',
+            'maxWidth': '1200px',
+            'margin': '0 auto'
+        }),
 
     ],
     style={
-        'display': 'flex',
-        'flexDirection': 'row',
-        'justifyContent': 'space-between',
-        'alignItems': 'flex-start',
-        'gap': '25px',
-        'maxWidth': '1200px',
-        'margin': '0 auto'
-    }),
-
-],
-style={
-    'backgroundColor': COLOR_FONDO,
-    'minHeight': '100vh',
-    'padding': '40px 20px',
-    'fontFamily': 'Segoe UI, sans-serif'
-})
+        'backgroundColor': COLOR_FONDO,
+        'minHeight': '100vh',
+        'padding': '40px 20px',
+        'fontFamily': 'Segoe UI, sans-serif'
+    })
@@ -3,111 +3,137 @@ import dash
 from dash import html, dcc, Input, Output, State
 import pandas as pd
 import requests
+import plotly.graph_objects as go
 
 from utils.funciones import (
     obtener_datos_covid,
-    obtener_lista_paises,
+    obtener_snapshot_global,
     figura_lineal_covid,
     mapa_covid_global
 )
+from utils.concurrencia import lanzar, esperar, en_paralelo
+from utils.paises import registro
+from utils.muestreo import puntos_para_ancho
+from utils.compacto import compactar_figura
 
 dash.register_page(__name__, path="/covid", name="COVID 19")
 
-# precarga de lista de países (si falla, lista vacía)
-try:
-    PAISES = obtener_lista_paises()
-except Exception:
-    PAISES = []
+# plazos (segundos) de cada llamada externa dentro de los callbacks
+PLAZO_HISTORICO = 12
+PLAZO_GLOBAL = 6
+
 
 # LAYOUT (dos columnas: izquierda controles, derecha tarjetas+gráficos)
-layout = html.Div(className="covid-contenedor", children=[
-
-    # panel izquierdo: controles
-    html.Div(className="covid-panel-izquierdo", children=[
-        html.H2("Dashboard COVID-19", className="titulo-panel"),
-
-        html.Label("Seleccione el país:", className="label"),
-        dcc.Dropdown(
-            id="pais-dropdown",
-            options=[{"label": p, "value": p} for p in PAISES],
-            value="Peru" if "Peru" in PAISES else (PAISES[0] if PAISES else None),
-            className="dropdown",
-            clearable=False
-        ),
-
-        html.Label("Días histórico (últimos N):", className="label"),
-        dcc.Dropdown(
-            id="dias-dropdown",
-            options=[
-                {"label": "Últimos 30 días", "value": 30},
-                {"label": "Últimos 90 días", "value": 90},
-                {"label": "Últimos 180 días", "value": 180},
-                {"label": "Todo el histórico", "value": "all"},
-            ],
-            value="all",
-            className="dropdown",
-            clearable=False
-        ),
-
-        html.Button("Actualizar Datos", id="btn-actualizar", n_clicks=0, className="btn-actualizar"),
-        html.Div(id="texto-actualizacion", className="texto-actualizacion")
-    ]),
-
-    # panel derecho: tarjetas + gráfico + mapa debajo
-    html.Div(className="covid-panel-derecho", children=[
-
-        # tarjetas
-        html.Div(className="covid-estadisticas", children=[
-            html.Div(className="card", children=[html.H4("Total casos"), html.H3(id="card-total-casos")]),
-            html.Div(className="card", children=[html.H4("Casos nuevos"), html.H3(id="card-casos-nuevos")]),
-            html.Div(className="card", children=[html.H4("Total muertes"), html.H3(id="card-total-muertes")]),
-            html.Div(className="card", children=[html.H4("Recuperados"), html.H3(id="card-total-recuperados")]),
+# Es función: la lista de países sale del registro (data/paises.json).
+# Se muestra el nombre común y el valor es el de disease.sh ("USA", "S. Korea"...)
+def layout(**kwargs):
+    paises = registro().con_covid()
+    PAISES = [p.nombre_covid for p in paises]
+    opciones = [{"label": p.nombre, "value": p.nombre_covid} for p in paises]
+    return html.Div(className="covid-contenedor", children=[
+
+        # panel izquierdo: controles
+        html.Div(className="covid-panel-izquierdo", children=[
+            html.H2("Dashboard COVID-19", className="titulo-panel"),
+
+            html.Label("Seleccione el país:", className="label"),
+            dcc.Dropdown(
+                id="pais-dropdown",
+                options=opciones,
+                value="Peru" if "Peru" in PAISES else (PAISES[0] if PAISES else None),
+                className="dropdown",
+                clearable=False
+            ),
+
+            html.Label("Días histórico (últimos N):", className="label"),
+            dcc.Dropdown(
+                id="dias-dropdown",
+                options=[
+                    {"label": "Últimos 30 días", "value": 30},
+                    {"label": "Últimos 90 días", "value": 90},
+                    {"label": "Últimos 180 días", "value": 180},
+                    {"label": "Todo el histórico", "value": "all"},
+                ],
+                value="all",
+                className="dropdown",
+                clearable=False
+            ),
+
+            html.Button("Actualizar Datos", id="btn-actualizar", n_clicks=0, className="btn-actualizar"),
+            html.Div(id="texto-actualizacion", className="texto-actualizacion")
         ]),
 
-        # gráfico lineal
-        dcc.Graph(id="grafico-covid", style={"height": "430px", "width": "100%"}),
-
-        # mapa global
-        dcc.Graph(id="grafico-mapa", style={"height": "560px", "width": "100%", "marginTop": "18px"})
+        # panel derecho: tarjetas + gráfico + mapa debajo
+        html.Div(className="covid-panel-derecho", children=[
+
+            # tarjetas
+            html.Div(className="covid-estadisticas", children=[
+                html.Div(className="card", children=[html.H4("Total casos"), html.H3(id="card-total-casos")]),
+                html.Div(className="card", children=[html.H4("Casos nuevos"), html.H3(id="card-casos-nuevos")]),
+                html.Div(className="card", children=[html.H4("Total muertes"), html.H3(id="card-total-muertes")]),
+                html.Div(className="card", children=[html.H4("Recuperados"), html.H3(id="card-total-recuperados")]),
+            ]),
+
+            # gráfico lineal (+ ancho en píxeles, para decidir cuántos puntos enviar)
+            dcc.Graph(id="grafico-covid", style={"height": "430px", "width": "100%"}),
+            dcc.Store(id="covid-ancho"),
+
+            # mapa global (se pide al cargar la página y con su propio botón)
+            dcc.Graph(id="grafico-mapa", style={"height": "560px", "width": "100%", "marginTop": "18px"}),
+            html.Button("Actualizar mapa", id="btn-actualizar-mapa", n_clicks=0, className="btn-actualizar")
+        ])
     ])
-])
 
 
-# CALLBACK: actualiza gráfico, mapa y tarjetas
+# CALLBACK (navegador): ancho real del gráfico
+dash.clientside_callback(
+    """
+    function(n_clicks) {
+        var grafico = document.getElementById("grafico-covid");
+        return grafico ? grafico.offsetWidth : window.innerWidth;
+    }
+    """,
+    Output("covid-ancho", "data"),
+    Input("btn-actualizar", "n_clicks")
+)
+
+
+# CALLBACK: actualiza gráfico y tarjetas del país
 @dash.callback(
     Output("grafico-covid", "figure"),
-    Output("grafico-mapa", "figure"),
     Output("card-total-casos", "children"),
     Output("card-casos-nuevos", "children"),
     Output("card-total-muertes", "children"),
     Output("card-total-recuperados", "children"),
     Output("texto-actualizacion", "children"),
     Input("btn-actualizar", "n_clicks"),
+    Input("covid-ancho", "data"),
     State("pais-dropdown", "value"),
     State("dias-dropdown", "value")
 )
-def actualizar_dashboard(n_clicks, pais, dias):
+def actualizar_dashboard(n_clicks, ancho, pais, dias):
     # seguridad: si no hay país seleccionado
     if not pais:
         empty_fig = figura_lineal_covid(None, "")
-        return empty_fig, mapa_covid_global(), "?", "?", "?", "?", "Selecciona un país."
+        return empty_fig, "?", "?", "?", "?", "Selecciona un país."
 
-    # obtener históricos
-    df = obtener_datos_covid(pais)
+    # histórico del país y foto global a la vez, cada uno con su plazo contado
+    # desde ahora: lo peor es el plazo más largo, no la suma. La foto se sirve
+    # de memoria (se renueva en segundo plano), así que su tarea no retiene
+    # un hilo del pool salvo antes de la primera descarga
+    futuro_historico = lanzar(obtener_datos_covid, pais)
+    futuro_global = lanzar(obtener_snapshot_global)
+
+    df, _ = esperar(futuro_historico, PLAZO_HISTORICO)
     if df is None or df.empty:
-        return figura_lineal_covid(None, pais), mapa_covid_global(), "?", "?", "?", "?", f"No hay datos para {pais}."
+        # sin histórico (error o plazo vencido): al menos los totales de la foto global
+        snapshot, _ = esperar(futuro_global, PLAZO_GLOBAL)
+        return (figura_lineal_covid(None, pais),) + _tarjetas_globales(snapshot, pais)
 
-    # filtrar por días si corresponde
-    if dias != "all":
-        try:
-            dias_n = int(dias)
-            df = df.tail(dias_n).reset_index(drop=True)
-        except Exception:
-            pass
+    df = _filtrar_dias(df, dias)
 
-    # construir figuras
-    fig_line = figura_lineal_covid(df, pais)
-    fig_map = mapa_covid_global()
+    # construir figura (reducida con LTTB al ancho del gráfico)
+    fig_line = compactar_figura(figura_lineal_covid(df, pais, max_puntos=puntos_para_ancho(ancho)))
 
     # tarjetas
     total_casos = f"{int(df['casos'].iloc[-1]):,}"
@@ -117,4 +143,90 @@ def actualizar_dashboard(n_clicks, pais, dias):
 
     texto = f"Datos actualizados para {pais}."
 
-    return fig_line, fig_map, total_casos, casos_nuevos, total_muertes, recuperados, texto
+    return fig_line, total_casos, casos_nuevos, total_muertes, recuperados, texto
+
+
+def _filtrar_dias(df, dias):
+    """Últimos N días si corresponde ("all" = todo el histórico)."""
+    if dias != "all":
+        try:
+            dias_n = int(dias)
+            df = df.tail(dias_n).reset_index(drop=True)
+        except Exception:
+            pass
+    return df
+
+
+# CALLBACK: al hacer zoom se reenvía el tramo visible con más detalle
+# (la serie viene del almacén local, no vuelve a pedirse a la API)
+@dash.callback(
+    Output("grafico-covid", "figure", allow_duplicate=True),
+    Input("grafico-covid", "relayoutData"),
+    State("covid-ancho", "data"),
+    State("pais-dropdown", "value"),
+    State("dias-dropdown", "value"),
+    prevent_initial_call=True
+)
+def detalle_zoom(relayout, ancho, pais, dias):
+    relayout = relayout or {}
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        desde = pd.to_datetime(relayout["xaxis.range[0]"])
+        hasta = pd.to_datetime(relayout["xaxis.range[1]"])
+    elif relayout.get("xaxis.autorange"):
+        desde = hasta = None
+    else:
+        # pan vertical, leyenda, autosize...: nada que recalcular
+        raise dash.exceptions.PreventUpdate
+
+    if not pais:
+        raise dash.exceptions.PreventUpdate
+
+    df, _ = esperar(lanzar(obtener_datos_covid, pais), PLAZO_HISTORICO)
+    if df is None or df.empty:
+        raise dash.exceptions.PreventUpdate
+
+    df = _filtrar_dias(df, dias)
+    if desde is not None:
+        # un día de margen a cada lado para que la línea llegue a los bordes
+        visible = (df["fecha"] >= desde - pd.Timedelta(days=1)) & (df["fecha"] <= hasta + pd.Timedelta(days=1))
+        df = df[visible].reset_index(drop=True)
+
+    return compactar_figura(figura_lineal_covid(df, pais, max_puntos=puntos_para_ancho(ancho)))
+
+
+def _tarjetas_globales(snapshot, pais):
+    """Tarjetas con los totales actuales de /countries cuando falta el histórico."""
+    if snapshot is None:
+        return "?", "?", "?", "?", f"No hay datos para {pais}."
+
+    fila = snapshot["df"][snapshot["df"]["country"] == pais]
+    if fila.empty:
+        return "?", "?", "?", "?", f"No hay datos para {pais}."
+
+    fila = fila.iloc[0]
+    return (f"{int(fila['cases']):,}", "?", f"{int(fila['deaths']):,}", f"{int(fila['recovered']):,}",
+            f"Histórico no disponible para {pais}; se muestran los totales actuales.")
+
+
+# CALLBACK: mapa global. No depende del país ni de "Actualizar Datos", así
+# cambiar de país no vuelve a enviar el mapa (~25 KB)
+@dash.callback(
+    Output("grafico-mapa", "figure"),
+    Input("btn-actualizar-mapa", "n_clicks")
+)
+def actualizar_mapa(n_clicks):
+    # la figura viene ya construida en la foto global (TTL); si la API tarda
+    # más que el plazo se muestra un aviso en vez de bloquear al worker
+    resultados, fallos = en_paralelo({"mapa": (PLAZO_GLOBAL, mapa_covid_global)})
+
+    if "mapa" in fallos:
+        fig = go.Figure()
+        fig.update_layout(
+            title="Mapa no disponible por ahora (presiona Actualizar mapa)",
+            title_x=0.5,
+            font=dict(family="Caveat Brush", size=16, color="#75232c"),
+            paper_bgcolor="rgba(255,255,255,0)"
+        )
+        return fig
+
+    return resultados["mapa"]
@@ -1,7 +1,8 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State
 
-from utils.funciones import grafica_logistica
+from utils.funciones import grafica_logistica, LOGISTICA_EN_NAVEGADOR
+from utils.cache import cache_figura
 
 # Registro de página
 dash.register_page(
@@ -11,100 +12,124 @@ dash.register_page(
 )
 
 # Layout con el diseño del dashboard
-layout = html.Div(
-    className="contenedor-principal",
-    children=[
-
-        # ------------------------
-        # COLUMNA IZQUIERDA
-        # ------------------------
-        html.Div(
-            className="contenedor-izquierdo",
-            children=[
-                html.H2("Parámetros del modelo (Refactorizado)", className="titulo"),
-
-                html.Div([
-                    html.Label("Población inicial P₀:", className="input-label"),
-                    dcc.Input(
-                        id="input-p0-ref",
-                        type="number",
-                        value=200,
-                        className="input-field"
-                    ),
-                ]),
-
-                html.Div([
-                    html.Label("Tasa de crecimiento r:", className="input-label"),
-                    dcc.Input(
-                        id="input-r-ref",
-                        type="number",
-                        value=0.04,
-                        className="input-field"
-                    ),
-                ]),
-
-                html.Div([
-                    html.Label("Capacidad de carga K:", className="input-label"),
-                    dcc.Input(
-                        id="input-k-ref",
-                        type="number",
-                        value=750,
-                        className="input-field"
-                    ),
-                ]),
-
-                html.Div([
-                    html.Label("Tiempo máximo t:", className="input-label"),
-                    dcc.Input(
-                        id="input-t-ref",
-                        type="number",
-                        value=100,
-                        className="input-field"
+# Es función para que la figura inicial se arme en la primera visita (y quede en caché)
+def layout(**kwargs):
+    return html.Div(
+        className="contenedor-principal",
+        children=[
+
+            # ------------------------
+            # COLUMNA IZQUIERDA
+            # ------------------------
+            html.Div(
+                className="contenedor-izquierdo",
+                children=[
+                    html.H2("Parámetros del modelo (Refactorizado)", className="titulo"),
+
+                    html.Div([
+                        html.Label("Población inicial P₀:", className="input-label"),
+                        dcc.Input(
+                            id="input-p0-ref",
+                            type="number",
+                            value=200,
+                            className="input-field"
+                        ),
+                    ]),
+
+                    html.Div([
+                        html.Label("Tasa de crecimiento r:", className="input-label"),
+                        dcc.Input(
+                            id="input-r-ref",
+                            type="number",
+                            value=0.04,
+                            className="input-field"
+                        ),
+                    ]),
+
+                    html.Div([
+                        html.Label("Capacidad de carga K:", className="input-label"),
+                        dcc.Input(
+                            id="input-k-ref",
+                            type="number",
+                            value=750,
+                            className="input-field"
+                        ),
+                    ]),
+
+                    html.Div([
+                        html.Label("Tiempo máximo t:", className="input-label"),
+                        dcc.Input(
+                            id="input-t-ref",
+                            type="number",
+                            value=100,
+                            className="input-field"
+                        ),
+                    ]),
+
+                    html.Button(
+                        "Generar gráfico",
+                        id="btn-generar-ref",
+                        n_clicks=0,
+                        className="btn-generar"
+                    )
+                ]
+            ),
+
+            # ------------------------
+            # COLUMNA DERECHA
+            # ------------------------
+            html.Div(
+                className="contenedor-derecho",
+                children=[
+                    html.H3(
+                        "Modelo Logístico Generado con Función Externa",
+                        style={"textAlign": "center", "color": "#d0021b"}
                     ),
-                ]),
-
-                html.Button(
-                    "Generar gráfico",
-                    id="btn-generar-ref",
-                    n_clicks=0,
-                    className="btn-generar"
-                )
-            ]
-        ),
-
-        # ------------------------
-        # COLUMNA DERECHA
-        # ------------------------
-        html.Div(
-            className="contenedor-derecho",
-            children=[
-                html.H3(
-                    "Modelo Logístico Generado con Función Externa",
-                    style={"textAlign": "center", "color": "#d0021b"}
-                ),
-                dcc.Graph(
-                    id="graph-logistico-refactorizado",
-                    style={"height": "430px", "width": "100%"}
-                )
-            ]
-        )
-    ]
-)
+                    dcc.Graph(
+                        id="graph-logistico-refactorizado",
+                        # figura inicial con todo el estilo (el navegador sólo cambia los datos)
+                        figure=figura_logistica(200, 0.04, 750, 100),
+                        style={"height": "430px", "width": "100%"}
+                    )
+                ]
+            )
+        ]
+    )
 
 
 # --------------------------------
 # CALLBACK
 # --------------------------------
-@callback(
-    Output("graph-logistico-refactorizado", "figure"),
-    Input("btn-generar-ref", "n_clicks"),
-    State("input-p0-ref", "value"),
-    State("input-r-ref", "value"),
-    State("input-k-ref", "value"),
-    State("input-t-ref", "value"),
-    prevent_initial_call=False
-)
 def update_graph_refactorizado(n_clicks, p0, r, k, t_max):
-    # Simplemente llamamos la función del archivo funciones.py
-    fig = grafica_logistica(p0, r, k, t_max)
-    return fig
+    # Simplemente llamamos la función del archivo funciones.py (vía caché)
+    return figura_logistica(p0, r, k, t_max)
+
+
+if LOGISTICA_EN_NAVEGADOR:
+    # Fórmula cerrada: se evalúa en el navegador sin ir al servidor
+    clientside_callback(
+        ClientsideFunction(namespace="logistica", function_name="llamado"),
+        Output("graph-logistico-refactorizado", "figure"),
+        Input("btn-generar-ref", "n_clicks"),
+        State("input-p0-ref", "value"),
+        State("input-r-ref", "value"),
+        State("input-k-ref", "value"),
+        State("input-t-ref", "value"),
+        State("graph-logistico-refactorizado", "figure"),
+        prevent_initial_call=True
+    )
+else:
+    callback(
+        Output("graph-logistico-refactorizado", "figure"),
+        Input("btn-generar-ref", "n_clicks"),
+        State("input-p0-ref", "value"),
+        State("input-r-ref", "value"),
+        State("input-k-ref", "value"),
+        State("input-t-ref", "value"),
+        prevent_initial_call=True
+    )(update_graph_refactorizado)
+
+
+@cache_figura(maxsize=256)
+def figura_logistica(p0, r, k, t_max):
+    return grafica_logistica(p0, r, k, t_max)
@@ -4,6 +4,9 @@ import plotly.graph_objects as go
 import numpy as np
 from scipy.integrate import odeint
 
+from utils.modelos import rumor, jac_rumor
+from utils.snapshots import snapshot
+
 dash.register_page(__name__, path="/modelo_sir_rumor", name="Modelo SIR - Rumor")
 
 # ======================================================
@@ -20,17 +23,6 @@ COLOR_I = "#D32F2F"            # rojo fuerte
 COLOR_R = "#388E3C"            # verde fuerte
 
 
-# ======================================================
-# Modelo del rumor
-# ======================================================
-def modelo_rumor(y, t, b, k):
-    S, I, R = y
-    dS_dt = -b * S * I
-    dI_dt = (b * S * I) - (k * I * R)
-    dR_dt = k * I * R
-    return [dS_dt, dI_dt, dR_dt]
-
-
 # Parámetros iniciales
 S0, I0, R0 = 266.0, 1.0, 8.0
 y0 = [S0, I0, R0]
@@ -38,12 +30,7 @@ N = S0 + I0 + R0
 b = 0.004
 t = np.linspace(0, 15, 150)
 
-# Soluciones
 k1, k2 = 0.01, 0.02
-sol1 = odeint(modelo_rumor, y0, t, args=(b, k1))
-sol2 = odeint(modelo_rumor, y0, t, args=(b, k2))
-S1, I1, R1 = sol1.T
-S2, I2, R2 = sol2.T
 
 
 # ======================================================
@@ -88,8 +75,19 @@ def crear_grafico(tiempo, s, i, r, titulo):
     return fig
 
 
-fig_k1 = crear_grafico(t, S1, I1, R1, "Evolución del Rumor — k = 0.01")
-fig_k2 = crear_grafico(t, S2, I2, R2, "Evolución del Rumor — k = 0.02")
+# ======================================================
+# Soluciones + figuras (sólo al primer acceso)
+# ======================================================
+def construir_figuras():
+    sol1 = odeint(rumor, y0, t, args=(b, k1), Dfun=jac_rumor, tfirst=True)
+    sol2 = odeint(rumor, y0, t, args=(b, k2), Dfun=jac_rumor, tfirst=True)
+    S1, I1, R1 = sol1.T
+    S2, I2, R2 = sol2.T
+
+    return {
+        "k1": crear_grafico(t, S1, I1, R1, "Evolución del Rumor — k = 0.01"),
+        "k2": crear_grafico(t, S2, I2, R2, "Evolución del Rumor — k = 0.02"),
+    }
 
 
 # ======================================================
@@ -127,46 +125,49 @@ texto_parametros = f"""
 # ======================================================
 # Layout final — Tema claro
 # ======================================================
-layout = html.Div([
+def layout(**kwargs):
+    figuras = snapshot("rumor", construir_figuras)
 
-    html.H1(
-        "Modelo SIR Aplicado a Rumores",
-        className="titulo-seccion",
-        style={"textAlign": "center", "color": COLOR_ACCENT, "padding": "20px 0"}
-    ),
+    return html.Div([
+
+        html.H1(
+            "Modelo SIR Aplicado a Rumores",
+            className="titulo-seccion",
+            style={"textAlign": "center", "color": COLOR_ACCENT, "padding": "20px 0"}
+        ),
 
-    html.Div([
-        # Gráficos
         html.Div([
-            html.Div(dcc.Graph(figure=fig_k1), className="card"),
-            html.Div(dcc.Graph(figure=fig_k2), className="card"),
+            # Gráficos
+            html.Div([
+                html.Div(dcc.Graph(figure=figuras["k1"]), className="card"),
+                html.Div(dcc.Graph(figure=figuras["k2"]), className="card"),
+            ], style={
+                "flex": "2",
+                "display": "flex",
+                "flexDirection": "column",
+                "gap": "20px"
+            }),
+
+            # Explicaciones
+            html.Div([
+                html.Div([dcc.Markdown(texto_ecuaciones, mathjax=True)], className="card"),
+                html.Div([dcc.Markdown(texto_parametros, mathjax=True)], className="card"),
+                html.Div([
+                    html.P(
+                        "El parámetro k mide cuán efectivos son los racionales "
+                        "para detener la propagación del rumor.",
+                        style={"fontSize": "0.9em", "color": "#555"}
+                    )
+                ], className="card")
+            ], style={"flex": "1", "paddingLeft": "20px"})
+
         ], style={
-            "flex": "2",
             "display": "flex",
-            "flexDirection": "column",
+            "padding": "20px",
             "gap": "20px"
-        }),
-
-        # Explicaciones
-        html.Div([
-            html.Div([dcc.Markdown(texto_ecuaciones, mathjax=True)], className="card"),
-            html.Div([dcc.Markdown(texto_parametros, mathjax=True)], className="card"),
-            html.Div([
-                html.P(
-                    "El parámetro k mide cuán efectivos son los racionales "
-                    "para detener la propagación del rumor.",
-                    style={"fontSize": "0.9em", "color": "#555"}
-                )
-            ], className="card")
-        ], style={"flex": "1", "paddingLeft": "20px"})
+        })
 
     ], style={
-        "display": "flex",
-        "padding": "20px",
-        "gap": "20px"
+        "backgroundColor": COLOR_BG,
+        "minHeight": "100vh"
     })
-
-], style={
-    "backgroundColor": COLOR_BG,
-    "minHeight": "100vh"
-})
@@ -2,7 +2,9 @@ import dash
 from dash import html, dcc
 import plotly.graph_objects as go
 import numpy as np
-from scipy.integrate import odeint
+
+from utils.modelos import resolver_sir_ensamble
+from utils.snapshots import snapshot
 
 dash.register_page(
     __name__, 
@@ -27,13 +29,6 @@ COLOR_GRID = "#DDDDDD"
 # ======================================================
 # MODELO SIR
 # ======================================================
-def modelo_sir(y, t, b, g):
-    S, I, R = y
-    dS_dt = -b * S * I
-    dI_dt = b * S * I - g * I
-    dR_dt = g * I
-    return [dS_dt, dI_dt, dR_dt]
-
 N = 10000.0
 I0 = 10.0
 S0 = N - I0
@@ -46,16 +41,9 @@ gamma_base = 0.25
 R0_base = 2.5
 beta_base = R0_base * gamma_base / N
 
-sol1 = odeint(modelo_sir, y0, t, args=(beta_base, gamma_base))
-I1 = sol1[:, 1]
-
 beta_double = beta_base * 2
-sol2 = odeint(modelo_sir, y0, t, args=(beta_double, gamma_base))
-I2 = sol2[:, 1]
-
 gamma_double = gamma_base * 2
-sol3 = odeint(modelo_sir, y0, t, args=(beta_base, gamma_double))
-I3 = sol3[:, 1]
+
 
 # ======================================================
 # GRÁFICO — VERSIÓN LIMPIA MODO CLARO
@@ -106,75 +94,91 @@ def crear_grafico_infectados(tiempo, datos_i, titulo, y_max=None):
     return fig
 
 
-fig_base = crear_grafico_infectados(t, I1, "I(t) - baseline (escenario)", y_max=2500)
-fig_b_double = crear_grafico_infectados(t, I2, "I(t) - β duplicado", y_max=5000)
-fig_k_double = crear_grafico_infectados(t, I3, "I(t) - γ duplicado", y_max=300)
+# ======================================================
+# SOLUCIONES + FIGURAS (sólo al primer acceso)
+# ======================================================
+def construir_figuras():
+    sol = resolver_sir_ensamble(
+        [beta_base, beta_double, beta_base],
+        [gamma_base, gamma_base, gamma_double],
+        y0, t
+    )
+    I1, I2, I3 = sol[:, 1]
+
+    return {
+        "base": crear_grafico_infectados(t, I1, "I(t) - baseline (escenario)", y_max=2500),
+        "b_double": crear_grafico_infectados(t, I2, "I(t) - β duplicado", y_max=5000),
+        "k_double": crear_grafico_infectados(t, I3, "I(t) - γ duplicado", y_max=300),
+    }
 
 # ======================================================
 # LAYOUT MODO CLARO
 # ======================================================
-layout = html.Div([
-
-    html.H1(
-        "Dinámica de Infectados I(t): Análisis de Parámetros",
-        style={
-            "textAlign": "center",
-            "color": COLOR_TITULO,
-            "paddingBottom": "20px",
-            "fontSize": "26px"
-        }
-    ),
-
-    html.Div([
-        html.Div([
-            html.Div([dcc.Graph(figure=fig_base, config={"displayModeBar": False})],
-                     style={"flex": "1", "minWidth": "300px", "padding": "10px"}),
+def layout(**kwargs):
+    figuras = snapshot("promotores", construir_figuras)
+
+    return html.Div([
+
+        html.H1(
+            "Dinámica de Infectados I(t): Análisis de Parámetros",
+            style={
+                "textAlign": "center",
+                "color": COLOR_TITULO,
+                "paddingBottom": "20px",
+                "fontSize": "26px"
+            }
+        ),
 
-            html.Div([dcc.Graph(figure=fig_b_double, config={"displayModeBar": False})],
-                     style={"flex": "1", "minWidth": "300px", "padding": "10px"}),
+        html.Div([
+            html.Div([
+                html.Div([dcc.Graph(figure=figuras["base"], config={"displayModeBar": False})],
+                         style={"flex": "1", "minWidth": "300px", "padding": "10px"}),
+
+                html.Div([dcc.Graph(figure=figuras["b_double"], config={"displayModeBar": False})],
+                         style={"flex": "1", "minWidth": "300px", "padding": "10px"}),
+            ], style={
+                "display": "flex",
+                "flexWrap": "wrap",
+                "justifyContent": "center",
+                "width": "100%"
+            }),
+
+            html.Div([
+                html.Div([dcc.Graph(figure=figuras["k_double"], config={"displayModeBar": False})],
+                         style={"width": "60%", "minWidth": "300px", "margin": "0 auto", "padding": "10px"})
+            ], style={"width": "100%", "marginTop": "10px"}),
         ], style={
-            "display": "flex",
-            "flexWrap": "wrap",
-            "justifyContent": "center",
-            "width": "100%"
+            "backgroundColor": "#FFFFFF",
+            "borderRadius": "12px",
+            "padding": "20px",
+            "boxShadow": "0 2px 10px rgba(0,0,0,0.1)"
         }),
 
+        # ======================================================
+        # TEXTO EXPLICATIVO
+        # ======================================================
         html.Div([
-            html.Div([dcc.Graph(figure=fig_k_double, config={"displayModeBar": False})],
-                     style={"width": "60%", "minWidth": "300px", "margin": "0 auto", "padding": "10px"})
-        ], style={"width": "100%", "marginTop": "10px"}),
-    ], style={
-        "backgroundColor": "#FFFFFF",
-        "borderRadius": "12px",
-        "padding": "20px",
-        "boxShadow": "0 2px 10px rgba(0,0,0,0.1)"
-    }),
+            html.H4("Interpretación de los Escenarios", style={"color": "#004488"}),
 
-    # ======================================================
-    # TEXTO EXPLICATIVO
-    # ======================================================
-    html.Div([
-        html.H4("Interpretación de los Escenarios", style={"color": "#004488"}),
+            dcc.Markdown(r"""
+            Los gráficos muestran la evolución de los **infectados** \(I(t)\) bajo tres escenarios:
 
-        dcc.Markdown(r"""
-        Los gráficos muestran la evolución de los **infectados** \(I(t)\) bajo tres escenarios:
+            1. **Baseline:** Comportamiento estándar con \(R_0 \approx 2.5\).  
+            2. **β duplicado:** Aumenta la transmisión. El pico aparece **antes** y es **mucho mayor**.  
+            3. **γ duplicado:** Incrementa la recuperación. La curva se **aplana fuertemente**.
 
-        1. **Baseline:** Comportamiento estándar con \(R_0 \approx 2.5\).  
-        2. **β duplicado:** Aumenta la transmisión. El pico aparece **antes** y es **mucho mayor**.  
-        3. **γ duplicado:** Incrementa la recuperación. La curva se **aplana fuertemente**.
+            Estos resultados permiten evaluar cómo la propagación depende de los parámetros de transmisión y remoción.
+            """, mathjax=True, style={"color": "#333"})
+        ], style={
+            "marginTop": "30px",
+            "maxWidth": "800px",
+            "marginLeft": "auto",
+            "marginRight": "auto"
+        })
 
-        Estos resultados permiten evaluar cómo la propagación depende de los parámetros de transmisión y remoción.
-        """, mathjax=True, style={"color": "#333"})
     ], style={
-        "marginTop": "30px",
-        "maxWidth": "800px",
-        "marginLeft": "auto",
-        "marginRight": "auto"
+        "backgroundColor": "#F5F6FA",
+        "minHeight": "100vh",
+        "padding": "20px",
+        "fontFamily": "Inter, sans-serif"
     })
-
-], style={
-    "backgroundColor": "#F5F6FA",
-    "minHeight": "100vh",
-    "padding": "20px",
-    "fontFamily": "Inter, sans-serif"
-})
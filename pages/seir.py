@@ -4,6 +4,8 @@ import numpy as np
 from scipy.integrate import solve_ivp
 
 from utils.funciones import grafica_seir   # ⬅️ IMPORTAMOS EL ESTILO UNIFICADO
+from utils.cache import cache_figura, parche_trazas
+from utils.modelos import seir, jac_seir
 
 dash.register_page(__name__, path='/seir', name='Modelo SEIR')
 
@@ -104,23 +106,24 @@ def update_seir_graph(n_clicks, N, beta, gamma, sigma, I0, E0, t_max):
         return grafica_seir(t, np.zeros_like(t), np.zeros_like(t),
                             np.zeros_like(t), np.zeros_like(t))
 
+    # El gráfico ya tiene el layout (lo puso la carga inicial): sólo viajan
+    # las curvas y el rango de los ejes. La figura completa queda en caché.
+    return parche_trazas(figura_seir(N, beta, gamma, sigma, I0, E0, t_max))
+
+
+@cache_figura(maxsize=256)
+def figura_seir(N, beta, gamma, sigma, I0, E0, t_max):
+    """Integra el SEIR y construye la figura (cacheada por parámetros)."""
+
     # Condiciones iniciales
     R0 = 0
     S0 = N - I0 - E0
     y0 = [S0, E0, I0, R0]
 
-    # Sistema SEIR
-    def seir_model(t, y):
-        S, E, I, R = y
-        return [
-            -(beta * S * I) / N,
-            (beta * S * I) / N - sigma * E,
-            sigma * E - gamma * I,
-            gamma * I
-        ]
-
+    # Sistema SEIR (utils/modelos.py) con jacobiano analítico
     t_eval = np.linspace(0, t_max, 500)
-    sol = solve_ivp(seir_model, [0, t_max], y0, t_eval=t_eval)
+    sol = solve_ivp(seir, [0, t_max], y0, t_eval=t_eval, args=(beta, gamma, sigma, N),
+                    method="LSODA", jac=jac_seir, vectorized=True)
 
     S, E, I, R = sol.y
     t = sol.t
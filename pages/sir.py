@@ -3,6 +3,8 @@ from dash import html, dcc, callback, Input, Output, State
 import numpy as np
 from scipy.integrate import solve_ivp
 from utils.funciones import grafica_sir   # ← usa el mismo estilo
+from utils.cache import cache_figura, parche_trazas
+from utils.modelos import sir, jac_sir
 
 dash.register_page(__name__, path='/sir', name='Modelo SIR')
 
@@ -96,22 +98,24 @@ def update_sir_graph(n_clicks, N, beta, gamma, I0, t_max):
         S = I = R = np.zeros_like(t)
         return grafica_sir(t, S, I, R, t_max)
 
+    # El gráfico ya tiene el layout (lo puso la carga inicial): sólo viajan
+    # las curvas y el rango de los ejes. La figura completa queda en caché.
+    return parche_trazas(figura_sir(N, beta, gamma, I0, t_max))
+
+
+@cache_figura(maxsize=256)
+def figura_sir(N, beta, gamma, I0, t_max):
+    """Integra el SIR y construye la figura (cacheada por parámetros)."""
+
     # Condiciones iniciales
     R0 = 0
     S0 = N - I0
     y0 = [S0, I0, R0]
 
-    # Sistema SIR
-    def sir_model(t, y):
-        S, I, R = y
-        return [
-            -beta * S * I / N,
-            beta * S * I / N - gamma * I,
-            gamma * I
-        ]
-
+    # Sistema SIR (utils/modelos.py) con jacobiano analítico
     t_eval = np.linspace(0, t_max, 500)
-    sol = solve_ivp(sir_model, [0, t_max], y0, t_eval=t_eval)
+    sol = solve_ivp(sir, [0, t_max], y0, t_eval=t_eval, args=(beta, gamma, N),
+                    method="LSODA", jac=jac_sir, vectorized=True)
 
     S, I, R = sol.y
     t = sol.t
@@ -0,0 +1,13 @@
+# tests/test_cache.py
+from utils.cache import _normalizar
+
+
+def test_misma_clave_para_el_mismo_valor():
+    assert _normalizar(100) == _normalizar(100.0)
+    assert _normalizar(0.1 + 0.2) == _normalizar(0.3)
+    assert _normalizar([1, 0.1 + 0.2]) == (1.0, 0.3)
+
+
+def test_valores_chicos_distintos_no_colisionan():
+    assert _normalizar(1e-11) != _normalizar(2e-11)
+    assert _normalizar(3e-12) != 0.0
@@ -0,0 +1,101 @@
+# tests/test_campos.py
+import numpy as np
+import pytest
+
+from utils.campos import compilar_expresion, evaluar_expresion
+
+X = np.array([-1.0, 0.0, 2.0])
+Y = np.array([3.0, 0.5, -2.0])
+
+
+# ============================================================
+# Expresiones rechazadas por la lista blanca
+# ============================================================
+@pytest.mark.parametrize("texto", [
+    "__import__('os').system('ls')",
+    "__import__",
+    "open('/etc/passwd')",
+    "x.__class__",
+    "x.__class__.__mro__",
+    "np.sin.__globals__",
+    "np.load('datos.npy')",
+    "np.lib",
+    "np.random.rand()",
+    "(lambda: 1)()",
+    "lambda x: x",
+    "[x, y]",
+    "[v for v in x]",
+    "(x, y)",
+    "{'a': x}",
+    "x if y else 1",
+    "x < y",
+    "x and y",
+    "'abc'",
+    "b'abc'",
+    "True",
+    "None",
+    "sin(x=1)",
+    "z + 1",
+    "exec('1')",
+    "(x := 1)",
+    "x[0]",
+])
+def test_rechaza_expresiones_fuera_de_la_lista(texto):
+    with pytest.raises((ValueError, SyntaxError)):
+        compilar_expresion(texto)
+
+
+@pytest.mark.parametrize("texto", ["", "   ", None])
+def test_rechaza_expresion_vacia(texto):
+    with pytest.raises(ValueError):
+        compilar_expresion(texto)
+
+
+def test_rechazo_no_queda_en_cache():
+    antes = compilar_expresion.cache_info().currsize
+    with pytest.raises(ValueError):
+        compilar_expresion("np.load('x')")
+    assert compilar_expresion.cache_info().currsize == antes
+
+
+# ============================================================
+# Expresiones permitidas
+# ============================================================
+@pytest.mark.parametrize("texto, esperado", [
+    ("-y", -Y),
+    ("x - 0.1*y", X - 0.1 * Y),
+    ("np.sin(x) + cos(y)", np.sin(X) + np.cos(Y)),
+    ("x**2 - pi", X ** 2 - np.pi),
+    ("np.maximum(x, y) % 2", np.maximum(X, Y) % 2),
+    ("hypot(x, y) * np.e", np.hypot(X, Y) * np.e),
+])
+def test_evalua_expresiones_permitidas(texto, esperado):
+    np.testing.assert_allclose(evaluar_expresion(texto, X, Y), esperado)
+
+
+def test_enteros_se_evaluan_como_flotantes():
+    # 7 // 2 en flotantes sigue siendo 3.0, pero 2**0.5 no trunca
+    assert evaluar_expresion("2**0.5", X, Y) == pytest.approx(2 ** 0.5)
+    assert isinstance(evaluar_expresion("7 // 2", X, Y), float)
+
+
+# ============================================================
+# Desbordes y divisiones por cero
+# ============================================================
+@pytest.mark.parametrize("texto", ["9**9**9", "2**10000"])
+def test_potencias_enormes_desbordan_en_vez_de_colgar(texto):
+    with pytest.raises(OverflowError):
+        evaluar_expresion(texto, X, Y)
+
+
+@pytest.mark.parametrize("texto", ["1/0", "1//0", "1%0"])
+def test_division_por_cero_constante(texto):
+    with pytest.raises(ZeroDivisionError):
+        evaluar_expresion(texto, X, Y)
+
+
+def test_division_por_cero_en_arreglos_da_inf():
+    with np.errstate(divide="ignore"):
+        valores = evaluar_expresion("1/x", X, Y)
+    assert np.isinf(valores[1])
+    np.testing.assert_allclose(valores[[0, 2]], [-1.0, 0.5])
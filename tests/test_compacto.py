@@ -0,0 +1,36 @@
+# tests/test_compacto.py
+import numpy as np
+import pytest
+
+from utils.compacto import _cabe_en_f4
+
+
+def _cabe(valores):
+    arreglo = np.asarray(valores, dtype=np.float64)
+    with np.errstate(over="ignore"):
+        return _cabe_en_f4(arreglo, arreglo.astype(np.float32))
+
+
+@pytest.mark.parametrize("valores", [
+    np.linspace(0, 100, 500),
+    1000 * np.exp(-np.linspace(0, 5, 200)),
+    [0.0, 1.5, np.nan, 3.25],
+    [1, 2, 3, 16_000_000],
+    [],
+])
+def test_se_reduce_cuando_no_se_nota(valores):
+    assert _cabe(valores)
+
+
+@pytest.mark.parametrize("valores", [
+    # conteos acumulados sobre 2**24: float32 los redondea
+    [100_000_001, 100_000_003, 100_000_007],
+    # variación chica sobre un valor grande
+    np.linspace(1000.0, 1000.001, 50),
+    # epoch en milisegundos
+    [1.6e12 + 1, 1.6e12 + 2],
+    # desborda a inf en float32
+    [1.0, 1e300],
+])
+def test_no_se_reduce_si_cambia_lo_visible(valores):
+    assert not _cabe(valores)
@@ -0,0 +1,114 @@
+# tests/test_covid_cola.py
+import pandas as pd
+import pytest
+
+from utils import funciones
+
+
+def _serie(inicio, casos, muertes):
+    """DataFrame con el mismo formato que _descargar_datos_covid."""
+    df = pd.DataFrame({
+        "fecha": pd.date_range(inicio, periods=len(casos), freq="D"),
+        "casos": casos,
+        "muertes": muertes,
+        "recuperados": [0] * len(casos),
+    })
+    df["nuevos"] = df["casos"].diff().fillna(0).astype(int)
+    df["nuevas_muertes"] = df["muertes"].diff().fillna(0).astype(int)
+    return df
+
+
+@pytest.fixture
+def guardados(monkeypatch):
+    llamadas = []
+    monkeypatch.setattr(funciones, "guardar_covid",
+                        lambda pais, df, reemplazar=True: llamadas.append((pais, df.copy(), reemplazar)))
+    return llamadas
+
+
+def test_anexa_cola_y_recalcula_nuevos(monkeypatch, guardados):
+    guardada = _serie("2021-01-01", [10, 15, 20, 30, 35], [1, 1, 2, 2, 3])
+    # la cola se solapa con los dos últimos días guardados
+    cola = _serie("2021-01-04", [30, 35, 50, 52], [2, 3, 5, 5])
+    pedidos = []
+
+    def descargar(pais, lastdays="all"):
+        pedidos.append(lastdays)
+        return cola
+
+    monkeypatch.setattr(funciones, "_descargar_datos_covid", descargar)
+
+    df = funciones._actualizar_cola("Peru", guardada, edad=2 * 86400)
+
+    # días transcurridos + 1 de solape
+    assert pedidos == [3]
+    assert list(df["fecha"].dt.strftime("%m-%d")) == ["01-01", "01-02", "01-03", "01-04", "01-05", "01-06", "01-07"]
+    assert list(df["casos"]) == [10, 15, 20, 30, 35, 50, 52]
+    # el primer día anexado se calcula contra el último guardado, no queda en 0
+    assert list(df["nuevos"]) == [0, 5, 5, 10, 5, 15, 2]
+    assert list(df["nuevas_muertes"]) == [0, 0, 1, 0, 1, 2, 0]
+
+    # sólo se guardan las filas nuevas, anexadas
+    (pais, nuevas, reemplazar), = guardados
+    assert pais == "Peru" and reemplazar is False
+    assert list(nuevas["nuevos"]) == [15, 2]
+
+
+def test_sin_dias_nuevos_renueva_la_hora(monkeypatch, guardados):
+    guardada = _serie("2021-01-01", [10, 15], [0, 1])
+    monkeypatch.setattr(funciones, "_descargar_datos_covid",
+                        lambda pais, lastdays="all": _serie("2021-01-02", [15], [1]))
+
+    df = funciones._actualizar_cola("Peru", guardada, edad=3600)
+
+    pd.testing.assert_frame_equal(df, guardada)
+    (_, nuevas, reemplazar), = guardados
+    assert nuevas.empty and reemplazar is False
+
+
+def test_cola_con_hueco_descarga_todo(monkeypatch, guardados):
+    guardada = _serie("2021-01-01", [10, 15], [0, 1])
+    completa = _serie("2021-01-01", [10, 15, 18, 25, 30], [0, 1, 1, 2, 2])
+
+    def descargar(pais, lastdays="all"):
+        # la cola empieza después del último día guardado: no hay contra qué calcular
+        return completa if lastdays == "all" else _serie("2021-01-04", [25, 30], [2, 2])
+
+    monkeypatch.setattr(funciones, "_descargar_datos_covid", descargar)
+
+    df = funciones._actualizar_cola("Peru", guardada, edad=86400)
+
+    pd.testing.assert_frame_equal(df, completa)
+    (_, guardado, reemplazar), = guardados
+    assert reemplazar is True
+
+
+def test_hueco_sin_descarga_completa_conserva_lo_guardado(monkeypatch, guardados):
+    guardada = _serie("2021-01-01", [10, 15], [0, 1])
+
+    def descargar(pais, lastdays="all"):
+        # hay hueco, y la serie completa no llega (404, caída...)
+        return None if lastdays == "all" else _serie("2021-01-04", [25, 30], [2, 2])
+
+    monkeypatch.setattr(funciones, "_descargar_datos_covid", descargar)
+
+    df = funciones._actualizar_cola("Peru", guardada, edad=86400)
+
+    pd.testing.assert_frame_equal(df, guardada)
+    assert guardados == []
+
+
+@pytest.mark.parametrize("error", [KeyError("deaths"), ValueError("All arrays must be of the same length")])
+def test_cola_mal_formada_sirve_lo_guardado(monkeypatch, guardados, error):
+    guardada = _serie("2021-01-01", [10, 15], [0, 1])
+    monkeypatch.setattr(funciones, "leer_covid", lambda pais: (guardada, funciones.COVID_TTL + 1))
+
+    def descargar(pais, lastdays="all"):
+        raise error
+
+    monkeypatch.setattr(funciones, "_descargar_datos_covid", descargar)
+
+    df = funciones.obtener_datos_covid("Peru")
+
+    pd.testing.assert_frame_equal(df, guardada)
+    assert guardados == []
@@ -0,0 +1,18 @@
+# tests/test_paginas.py
+import types
+
+import dash
+import pytest
+
+from utils import paginas
+
+
+def test_dash_instalado_tiene_los_internos():
+    paginas.verificar_dash(dash.Dash(__name__))
+
+
+def test_sin_internos_falla_al_arrancar():
+    app = types.SimpleNamespace(callback_map={}, _got_first_request={"setup_server": False})
+
+    with pytest.raises(RuntimeError, match="Dash._callback_list"):
+        paginas.verificar_dash(app)
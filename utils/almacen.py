@@ -0,0 +1,160 @@
+# utils/almacen.py
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+# Un solo archivo SQLite compartido por todos los workers (sobrevive reinicios)
+RUTA_BD = Path(os.environ.get(
+    "TM_DATA_DB",
+    Path(__file__).resolve().parent.parent / ".cache" / "datos.sqlite3"
+))
+
+# disease.sh actualiza los históricos una vez al día
+COVID_TTL = float(os.environ.get("TM_COVID_TTL", 12 * 3600))
+
+# Open-Meteo recalcula sus pronósticos cada hora
+CLIMA_TTL = float(os.environ.get("TM_CLIMA_TTL", 3600))
+
+COLUMNAS_COVID = ["fecha", "casos", "muertes", "recuperados", "nuevos", "nuevas_muertes"]
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS covid_series (
+    pais TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    casos INTEGER,
+    muertes INTEGER,
+    recuperados INTEGER,
+    nuevos INTEGER,
+    nuevas_muertes INTEGER,
+    PRIMARY KEY (pais, fecha)
+);
+CREATE TABLE IF NOT EXISTS covid_actualizacion (
+    pais TEXT PRIMARY KEY,
+    actualizado REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clima (
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    datos TEXT NOT NULL,
+    actualizado REAL NOT NULL,
+    PRIMARY KEY (lat, lon)
+);
+"""
+
+
+def conectar():
+    """
+    Conexión nueva por llamada (los callbacks de Dash corren en varios hilos).
+    WAL permite que un worker lea mientras otro escribe.
+    """
+    RUTA_BD.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(RUTA_BD, timeout=10)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.executescript(_ESQUEMA)
+    return con
+
+
+# ============================================================
+# COVID: series históricas por país
+# ============================================================
+def leer_covid(pais):
+    """
+    Devuelve (df, edad). df es None si el país nunca se descargó;
+    edad son los segundos desde la última descarga (None si no hay).
+    """
+    con = conectar()
+    try:
+        fila = con.execute(
+            "SELECT actualizado FROM covid_actualizacion WHERE pais = ?", (pais,)
+        ).fetchone()
+        if fila is None:
+            return None, None
+
+        df = pd.read_sql_query(
+            "SELECT fecha, casos, muertes, recuperados, nuevos, nuevas_muertes "
+            "FROM covid_series WHERE pais = ? ORDER BY fecha",
+            con, params=(pais,)
+        )
+    finally:
+        con.close()
+
+    df["fecha"] = pd.to_datetime(df["fecha"], format="%Y-%m-%d")
+    return df, time.time() - fila[0]
+
+
+def _filas_covid(pais, df):
+    df = df.dropna(subset=["fecha"])
+
+    # .tolist() convierte a int de Python (sqlite3 no acepta numpy.int64)
+    columnas = [df["fecha"].dt.strftime("%Y-%m-%d").tolist()]
+    columnas += [df[c].astype("int64").tolist() for c in COLUMNAS_COVID[1:]]
+
+    return [(pais, *fila) for fila in zip(*columnas)]
+
+
+def guardar_covid(pais, df, reemplazar=True):
+    """
+    Guarda la serie del país y marca la hora de descarga.
+    Con reemplazar=False sólo agrega/actualiza las fechas de df (descarga incremental).
+    """
+    filas = _filas_covid(pais, df)
+
+    con = conectar()
+    try:
+        with con:
+            if reemplazar:
+                con.execute("DELETE FROM covid_series WHERE pais = ?", (pais,))
+            con.executemany(
+                "INSERT OR REPLACE INTO covid_series VALUES (?, ?, ?, ?, ?, ?, ?)", filas
+            )
+            con.execute(
+                "INSERT OR REPLACE INTO covid_actualizacion VALUES (?, ?)",
+                (pais, time.time())
+            )
+    finally:
+        con.close()
+
+
+# ============================================================
+# CLIMA: pronóstico horario por coordenada (redondeada)
+# ============================================================
+def leer_clima(lat, lon):
+    """Devuelve (df, edad) del pronóstico guardado o (None, None) si no hay."""
+    con = conectar()
+    try:
+        fila = con.execute(
+            "SELECT datos, actualizado FROM clima WHERE lat = ? AND lon = ?", (lat, lon)
+        ).fetchone()
+    finally:
+        con.close()
+
+    if fila is None:
+        return None, None
+
+    datos = json.loads(fila[0])
+    df = pd.DataFrame({"time": pd.to_datetime(datos["time"]), "temperature": datos["temperature"]})
+    return df, time.time() - fila[1]
+
+
+def guardar_clima(lat, lon, df):
+    datos = json.dumps({
+        "time": df["time"].dt.strftime("%Y-%m-%dT%H:%M").tolist(),
+        "temperature": df["temperature"].tolist()
+    })
+
+    con = conectar()
+    try:
+        with con:
+            con.execute(
+                "INSERT OR REPLACE INTO clima VALUES (?, ?, ?, ?)",
+                (lat, lon, datos, time.time())
+            )
+    finally:
+        con.close()
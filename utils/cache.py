@@ -0,0 +1,179 @@
+# utils/cache.py
+import base64
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+import numpy as np
+import plotly.io as pio
+from dash import Patch
+
+from utils.compacto import compactar_figura
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "bytes", "max_bytes"])
+
+
+# ============================================================
+# Normalización de parámetros (la clave del caché)
+# ============================================================
+def _normalizar(valor):
+    """
+    Convierte un parámetro de callback en algo hashable y estable:
+    100 y 100.0 dan la misma clave; los flotantes se redondean a 12 cifras
+    significativas (no a decimales fijos, que juntarían todos los valores
+    menores a 1e-10) para que 0.1 + 0.2 y 0.3 no generen dos entradas.
+    """
+    if valor is None or isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)):
+        return float(f"{float(valor):.12g}")
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    return valor
+
+
+# ============================================================
+# Caché LRU con presupuesto de bytes
+# ============================================================
+class CacheFiguras:
+    """
+    Guarda figuras ya serializadas (JSON) por clave.
+    Expulsa la menos usada cuando se supera maxsize o max_bytes.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=32 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._datos = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, clave):
+        with self._lock:
+            payload = self._datos.get(clave)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return payload
+
+    def put(self, clave, payload):
+        tam = len(payload.encode("utf-8"))
+        if tam > self.max_bytes:
+            # una figura más grande que todo el presupuesto no se guarda
+            return
+
+        with self._lock:
+            anterior = self._datos.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior.encode("utf-8"))
+
+            self._datos[clave] = payload
+            self._bytes += tam
+
+            while len(self._datos) > self.maxsize or self._bytes > self.max_bytes:
+                _, expulsado = self._datos.popitem(last=False)
+                self._bytes -= len(expulsado.encode("utf-8"))
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._datos), self._bytes, self.max_bytes)
+
+
+def cache_figura(maxsize=128, max_bytes=32 * 1024 * 1024):
+    """
+    Decorador para funciones que construyen una figura Plotly a partir de parámetros.
+
+    La primera llamada con unos parámetros integra y construye la figura;
+    las siguientes devuelven el JSON guardado (como dict) sin tocar el
+    solver ni go.Figure. Igual que lru_cache, expone cache_info() y cache_clear().
+    """
+    def decorador(funcion):
+        cache = CacheFiguras(maxsize=maxsize, max_bytes=max_bytes)
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = (_normalizar(args), tuple(sorted((k, _normalizar(v)) for k, v in kwargs.items())))
+
+            payload = cache.get(clave)
+            if payload is None:
+                payload = pio.to_json(compactar_figura(funcion(*args, **kwargs)), validate=False)
+                cache.put(clave, payload)
+
+            return json.loads(payload)
+
+        envoltura.cache = cache
+        envoltura.cache_info = cache.info
+        envoltura.cache_clear = cache.clear
+        return envoltura
+
+    return decorador
+
+
+# ============================================================
+# Actualización parcial de una figura ya mostrada
+# ============================================================
+def parche_trazas(figura, ejes=("xaxis", "yaxis")):
+    """
+    dash.Patch con sólo los arreglos x/y de cada traza y el rango de `ejes`,
+    tomados de `figura` (el dict que devuelve una función @cache_figura).
+
+    Sirve cuando el gráfico del navegador ya tiene el layout de esa figura
+    (mismas trazas, mismo estilo): el título, colores, leyenda, etc. no se
+    reenvían ni se vuelven a dibujar. Un eje x equiespaciado (np.linspace)
+    se manda como x0/dx en vez del arreglo.
+    """
+    parche = Patch()
+
+    for i, traza in enumerate(figura["data"]):
+        paso = _paso_uniforme(traza["x"])
+        if paso is None:
+            parche["data"][i]["x"] = traza["x"]
+        else:
+            del parche["data"][i]["x"]
+            parche["data"][i]["x0"], parche["data"][i]["dx"] = paso
+        parche["data"][i]["y"] = traza["y"]
+
+    for eje in ejes:
+        config = figura["layout"].get(eje, {})
+        if "range" in config:
+            parche["layout"][eje]["range"] = config["range"]
+        else:
+            parche["layout"][eje]["autorange"] = True
+
+    return parche
+
+
+def _paso_uniforme(x):
+    """(x0, dx) si x es equiespaciado; None si no (o si no es numérico)."""
+    try:
+        if isinstance(x, dict):  # arreglo tipado de plotly: {"dtype", "bdata"}
+            x = np.frombuffer(base64.b64decode(x["bdata"]), dtype=x["dtype"])
+        x = np.asarray(x)
+        if x.dtype.kind not in "fi":
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if x.ndim != 1 or len(x) < 2:
+        return None
+
+    # tolerancia según la precisión del arreglo (float32 en modo compacto)
+    eps = np.finfo(x.dtype).eps if x.dtype.kind == "f" else 0.0
+    x = x.astype(float)
+    dx = (x[-1] - x[0]) / (len(x) - 1)
+    if not np.allclose(np.diff(x), dx, rtol=1e-9, atol=max(4 * eps * np.abs(x).max(), 1e-12 * abs(dx))):
+        return None
+    return float(x[0]), float(dx)
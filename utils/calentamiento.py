@@ -0,0 +1,170 @@
+# utils/calentamiento.py
+import os
+import threading
+import time
+
+from flask import jsonify
+
+# utils.funciones, utils.referencia y utils.paises (pandas, plotly.express...)
+# se importan dentro de cada paso: importar la app no los carga, lo hace el
+# hilo de calentamiento o la primera página que los usa
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+# ISO2 de los países cuyo clima se deja en caché al arrancar
+PAISES_POPULARES = ["AR", "BR", "CL", "CO", "MX", "PE", "ES", "US"]
+
+# La tabla de países viene en data/paises.json; renovarla desde las APIs es opcional
+REFRESCAR_PAISES = os.environ.get("TM_REFRESCAR_PAISES", "0") == "1"
+
+PLAZO_CLIMA = 10
+ESPERA_MAX = 60  # tope del reintento con backoff (segundos)
+
+# /ready espera la primera pasada del calentamiento, pero no más de esto
+# (segundos desde el primer request): con las APIs caídas el worker igual entra
+GRACIA_READY = float(os.environ.get("TM_READY_GRACIA", 30))
+
+_ESTADO_INICIAL = {
+    "snapshot_covid": False,
+    "referencia_paises": not REFRESCAR_PAISES,
+    "clima_popular": False
+}
+_estado = dict(_ESTADO_INICIAL)
+_lock = threading.Lock()
+_hilo = None
+_inicio = None           # time.monotonic() al lanzar el hilo
+_primera_pasada = False  # cada paso se intentó al menos una vez
+
+
+def caliente():
+    """True cuando todas las cachés de APIs externas quedaron cargadas."""
+    return all(_estado.values())
+
+
+def listo():
+    """
+    True si el proceso puede atender: la tabla de países (data/paises.json)
+    cargó y el calentamiento ya hizo una pasada completa, o pasaron
+    GRACIA_READY segundos desde que empezó. Que disease.sh u Open-Meteo
+    fallen no lo impide: la pasada termina igual, con esos pasos pendientes.
+    """
+    if not _primera_pasada and (_inicio is None or time.monotonic() - _inicio < GRACIA_READY):
+        return False
+    try:
+        from utils.paises import registro
+        return len(registro()) > 0
+    except Exception:
+        return False
+
+
+# ============================================================
+# CALENTAMIENTO EN SEGUNDO PLANO
+# ============================================================
+def _cargar_snapshot_covid():
+    # foto global de disease.sh (tarjetas y mapa de la página COVID)
+    from utils.funciones import obtener_snapshot_global
+    if not obtener_snapshot_global()["paises"]:
+        raise RuntimeError("disease.sh no devolvió países")
+
+
+def _cargar_clima_popular():
+    # deja en caché (memoria + SQLite) el pronóstico de los países más visitados
+    from utils.concurrencia import en_paralelo
+    from utils.funciones import get_weather
+    from utils.paises import registro
+
+    paises = registro()
+    _, fallos = en_paralelo({
+        iso2: (PLAZO_CLIMA, get_weather, paises[iso2].lat, paises[iso2].lon)
+        for iso2 in PAISES_POPULARES
+    })
+    if fallos:
+        raise RuntimeError(f"sin clima para {sorted(fallos)}")
+
+
+def _actualizar_referencia():
+    from utils.referencia import actualizar_referencia
+    actualizar_referencia()
+
+
+_PASOS = {
+    "snapshot_covid": _cargar_snapshot_covid,
+    "referencia_paises": _actualizar_referencia,
+    "clima_popular": _cargar_clima_popular,
+}
+
+
+def _calentar():
+    global _primera_pasada
+    espera = 1
+    while not caliente():
+        for nombre, paso in _PASOS.items():
+            if _estado[nombre]:
+                continue
+            try:
+                paso()
+                _estado[nombre] = True
+            except Exception:
+                # API caída: las páginas siguen con data/paises.json y reintentamos
+                pass
+        _primera_pasada = True
+
+        if not caliente():
+            time.sleep(espera)
+            espera = min(espera * 2, ESPERA_MAX)
+    _primera_pasada = True
+
+
+def iniciar():
+    """Lanza el calentamiento una sola vez por proceso (no bloquea el arranque)."""
+    global _hilo, _inicio
+    if _hilo is not None:
+        return
+    with _lock:
+        if _hilo is None:
+            _inicio = time.monotonic()
+            _hilo = threading.Thread(target=_calentar, name="calentamiento", daemon=True)
+            _hilo.start()
+
+
+def _tras_fork():
+    # el worker hereda _hilo y _estado del padre, pero no el hilo: se vuelve a calentar
+    global _hilo, _lock, _inicio, _primera_pasada
+    _hilo = None
+    _lock = threading.Lock()
+    _inicio = None
+    _primera_pasada = False
+    _estado.update(_ESTADO_INICIAL)
+
+
+os.register_at_fork(after_in_child=_tras_fork)
+
+
+def registrar(server):
+    """
+    Calienta las cachés en el primer request de cada proceso (no al importar:
+    con gunicorn --preload el hilo quedaría en el padre y no en los workers).
+    """
+    server.before_request(iniciar)
+
+
+# ============================================================
+# ENDPOINT DE DISPONIBILIDAD
+# ============================================================
+def registrar_ready(server, ruta="/ready"):
+    """
+    GET /ready -> 200 si el proceso puede atender, 503 si no (ver listo()).
+    Pensado para el health check del balanceador: un worker nuevo no entra
+    hasta intentar llenar sus cachés, pero una caída de las APIs externas no
+    lo deja afuera (las páginas arrancan con data/paises.json); el estado de
+    las cachés va aparte, en "caliente" y "componentes".
+    """
+    def ready():
+        ok = listo()
+        respuesta = jsonify(listo=ok, caliente=caliente(), primera_pasada=_primera_pasada,
+                            componentes=dict(_estado))
+        respuesta.status_code = 200 if ok else 503
+        return respuesta
+
+    server.add_url_rule(ruta, "ready", ready)
@@ -0,0 +1,351 @@
+# utils/campos.py
+import ast
+import math
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Flechas visibles por eje como máximo: más que eso ya no se distinguen en pantalla
+MAX_FLECHAS_EJE = 70
+
+# Puntos de la malla por eje como máximo (el resto se decima igual; más sólo cuesta)
+MAX_MALLADO = 10_000
+
+# Trayectorias: tope de semillas y de puntos enviados al navegador (x e y en
+# float32: 40 000 puntos son ~0,4 MB de respuesta, sea cual sea el número de semillas)
+MAX_SEMILLAS = 1000
+MAX_PUNTOS_TRAYECTORIAS = 40_000
+
+
+# ============================================================
+# Expresiones del usuario: compilación con lista blanca
+# ============================================================
+FUNCIONES = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "log10": np.log10, "sqrt": np.sqrt,
+    "abs": np.abs, "sign": np.sign, "power": np.power,
+    "minimum": np.minimum, "maximum": np.maximum, "hypot": np.hypot,
+}
+CONSTANTES = {"pi": np.pi, "e": np.e}
+VARIABLES = {"x", "y"}
+
+_NODOS_PERMITIDOS = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Attribute,
+    ast.Constant, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+    ast.UAdd, ast.USub,
+)
+
+
+def _validar(arbol):
+    """Recorre el AST y rechaza todo lo que no sea aritmética sobre x, y y FUNCIONES."""
+    for nodo in ast.walk(arbol):
+        if not isinstance(nodo, _NODOS_PERMITIDOS):
+            raise ValueError(f"Expresión no permitida: {type(nodo).__name__}")
+
+        if isinstance(nodo, ast.Constant) and (
+                isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float))):
+            raise ValueError(f"Constante no permitida: {nodo.value!r}")
+
+        if isinstance(nodo, ast.Name) and nodo.id not in VARIABLES | FUNCIONES.keys() | CONSTANTES.keys() | {"np"}:
+            raise ValueError(f"Nombre no permitido: {nodo.id}")
+
+        # sólo np.<función de la lista>, nada de atributos arbitrarios
+        if isinstance(nodo, ast.Attribute) and not (
+                isinstance(nodo.value, ast.Name) and nodo.value.id == "np"
+                and (nodo.attr in FUNCIONES or nodo.attr in CONSTANTES)):
+            raise ValueError(f"Atributo no permitido: {ast.unparse(nodo)}")
+
+        if isinstance(nodo, ast.Call):
+            if nodo.keywords:
+                raise ValueError("Las funciones no admiten argumentos con nombre")
+            if not isinstance(nodo.func, (ast.Name, ast.Attribute)) or (
+                    isinstance(nodo.func, ast.Name) and nodo.func.id not in FUNCIONES):
+                raise ValueError(f"Llamada no permitida: {ast.unparse(nodo.func)}")
+
+
+@lru_cache(maxsize=256)
+def compilar_expresion(texto):
+    """
+    Valida y compila una expresión f(x, y) una sola vez.
+    Lanza ValueError/SyntaxError si no es válida (esas no se cachean).
+    """
+    if not texto or not str(texto).strip():
+        raise ValueError("Expresión vacía")
+
+    arbol = ast.parse(str(texto).strip(), mode="eval")
+    _validar(arbol)
+
+    # Enteros -> flotantes: "9**9**9" desborda al instante en vez de colgar el worker
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Constant):
+            nodo.value = float(nodo.value)
+
+    return compile(arbol, "<campo>", "eval")
+
+
+def evaluar_expresion(texto, x, y):
+    """Evalúa la expresión compilada sobre arreglos x, y."""
+    espacio = {"np": np, "x": x, "y": y, **FUNCIONES, **CONSTANTES}
+    return eval(compilar_expresion(texto), {"__builtins__": {}}, espacio)
+
+
+@lru_cache(maxsize=64)
+def evaluar_campo(eq_dxdt, eq_dydt, range_x, range_y, mallado, ventana=None):
+    """
+    Malla visible y valores (u, v) del campo, memorizados por
+    (expresiones, rango, mallado, ventana). Los arreglos se devuelven de
+    sólo lectura porque se comparten entre llamadas.
+    """
+    x_vals, y_vals = malla_visible(range_x, range_y, mallado, ventana)
+    x, y = np.meshgrid(x_vals, y_vals)
+
+    u = np.asarray(evaluar_expresion(eq_dxdt, x, y), dtype=float)
+    v = np.asarray(evaluar_expresion(eq_dydt, x, y), dtype=float)
+
+    for arreglo in (x_vals, y_vals, x, y, u, v):
+        arreglo.flags.writeable = False
+
+    return x_vals, y_vals, x, y, u, v
+
+
+# ============================================================
+# Malla: decimación según la ventana visible
+# ============================================================
+def ventana_desde_relayout(relayout):
+    """
+    Extrae (x0, x1, y0, y1) del relayoutData de dcc.Graph tras un zoom/pan.
+    Devuelve None si el usuario volvió a la vista completa o no hubo zoom.
+    """
+    if not relayout or relayout.get("xaxis.autorange") or relayout.get("autosize"):
+        return None
+
+    try:
+        if "xaxis.range" in relayout:
+            x0, x1 = relayout["xaxis.range"]
+        else:
+            x0, x1 = relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+
+        if "yaxis.range" in relayout:
+            y0, y1 = relayout["yaxis.range"]
+        else:
+            y0, y1 = relayout["yaxis.range[0]"], relayout["yaxis.range[1]"]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    return float(x0), float(x1), float(y0), float(y1)
+
+
+def _eje_visible(rango, mallado, lo=None, hi=None, max_por_eje=MAX_FLECHAS_EJE):
+    """
+    Valores de np.linspace(-rango, rango, mallado) con lo <= valor <= hi,
+    uno de cada `paso`, calculados como inicio + paso*k sin armar el linspace
+    completo (mallado puede ser enorme y la ventana mostrar sólo unos pocos).
+    """
+    if mallado == 1:
+        i0, i1, h = 0, 0, 0.0
+    else:
+        h = 2 * rango / (mallado - 1)
+        valor = lambda i: rango if i == mallado - 1 else -rango + i * h
+        i0, i1 = 0, mallado - 1
+        if lo is not None and h > 0:
+            # estimación con la fórmula y ajuste con los valores reales del borde
+            i0 = min(max(math.ceil((lo + rango) / h), 0), mallado)
+            while i0 > 0 and valor(i0 - 1) >= lo:
+                i0 -= 1
+            while i0 < mallado and valor(i0) < lo:
+                i0 += 1
+            i1 = min(max(math.floor((hi + rango) / h), -1), mallado - 1)
+            while i1 < mallado - 1 and valor(i1 + 1) <= hi:
+                i1 += 1
+            while i1 >= 0 and valor(i1) > hi:
+                i1 -= 1
+
+    cantidad = max(i1 - i0 + 1, 0)
+    paso = max(1, math.ceil(cantidad / max_por_eje))
+    indices = np.arange(i0, i1 + 1, paso)
+
+    valores = -rango + indices * h
+    if mallado > 1:
+        valores[indices == mallado - 1] = rango  # linspace deja el extremo exacto
+    return valores
+
+
+def malla_visible(range_x, range_y, mallado, ventana=None, max_por_eje=MAX_FLECHAS_EJE):
+    """
+    Puntos de la malla (mallado x mallado sobre [-range, range]) que caen en la
+    ventana, tomando uno de cada `paso` para no pasar de max_por_eje por eje.
+    Se decima sobre la malla global, así las flechas no "bailan" al hacer pan.
+    """
+    if ventana is None:
+        return (_eje_visible(range_x, mallado, max_por_eje=max_por_eje),
+                _eje_visible(range_y, mallado, max_por_eje=max_por_eje))
+
+    x0, x1, y0, y1 = ventana
+    return (_eje_visible(range_x, mallado, min(x0, x1), max(x0, x1), max_por_eje),
+            _eje_visible(range_y, mallado, min(y0, y1), max(y0, y1), max_por_eje))
+
+
+# ============================================================
+# Flechas: segmentos separados por NaN (una sola traza)
+# ============================================================
+def segmentos_flechas(x, y, u, v, largo):
+    """
+    Construye los arreglos [x0, x1, NaN, x0, x1, NaN, ...] del campo normalizado
+    sin bucles de Python: cada flecha es una fila (inicio, fin, corte).
+    """
+    # u, v pueden ser escalares (p. ej. dx/dt = 1)
+    x, y, u, v = (np.ravel(a) for a in np.broadcast_arrays(x, y, u, v))
+
+    mag = np.hypot(u, v) + 1e-9
+    escala = largo / mag
+
+    xs = np.empty((x.size, 3))
+    ys = np.empty((y.size, 3))
+    xs[:, 0] = x
+    xs[:, 1] = x + u * escala
+    xs[:, 2] = np.nan
+    ys[:, 0] = y
+    ys[:, 1] = y + v * escala
+    ys[:, 2] = np.nan
+
+    return xs.ravel(), ys.ravel()
+
+
+def figura_campo(x, y, u, v, largo, range_x, range_y, ventana=None):
+    """Figura WebGL (Scattergl) con las flechas y los puntos de la malla."""
+    xs, ys = segmentos_flechas(x, y, u, v, largo)
+
+    if ventana is None:
+        rango_x, rango_y = [-range_x, range_x], [-range_y, range_y]
+    else:
+        rango_x, rango_y = [ventana[0], ventana[1]], [ventana[2], ventana[3]]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(x=xs, y=ys, mode="lines", line=dict(width=1.2, color="blue"),
+                               connectgaps=False, hoverinfo="skip"))
+    fig.add_trace(go.Scattergl(x=np.ravel(x), y=np.ravel(y), mode="markers",
+                               marker=dict(size=2, color="red")))
+
+    fig.update_layout(
+        xaxis=dict(range=rango_x, scaleanchor="y"),
+        yaxis=dict(range=rango_y),
+        plot_bgcolor="white",
+        # mismo uirevision -> Plotly respeta el zoom del usuario al redibujar
+        uirevision=f"{range_x}:{range_y}"
+    )
+
+    return fig
+
+
+# ============================================================
+# Trayectorias: RK4 con todas las semillas como un solo estado
+# ============================================================
+def _derivadas(eq_dxdt, eq_dydt, x, y):
+    dx = np.broadcast_to(evaluar_expresion(eq_dxdt, x, y), x.shape)
+    dy = np.broadcast_to(evaluar_expresion(eq_dydt, x, y), y.shape)
+    return dx, dy
+
+
+def integrar_trayectorias(eq_dxdt, eq_dydt, x0, y0, t_final, pasos, limite, guardar_cada=1):
+    """
+    RK4 de paso fijo sobre el arreglo completo de semillas, hacia adelante y
+    hacia atrás a la vez (el paso dt es un arreglo con signo por semilla).
+    El costo crece con los pasos, no con el número de semillas.
+
+    Una trayectoria que sale de la caja |x|, |y| <= limite o diverge se corta
+    (NaN desde ese punto). Se guarda uno de cada `guardar_cada` pasos: X, Y
+    tienen forma (n_semillas, 2 * pasos // guardar_cada + 1), del pasado al futuro.
+    """
+    n = len(x0)
+    x = np.concatenate([x0, x0]).astype(float)
+    y = np.concatenate([y0, y0]).astype(float)
+    dt = np.concatenate([np.full(n, t_final / pasos), np.full(n, -t_final / pasos)])
+
+    X = np.empty((pasos // guardar_cada + 1, 2 * n))
+    Y = np.empty((pasos // guardar_cada + 1, 2 * n))
+    X[0], Y[0] = x, y
+
+    with np.errstate(all="ignore"):
+        for k in range(1, pasos + 1):
+            k1x, k1y = _derivadas(eq_dxdt, eq_dydt, x, y)
+            k2x, k2y = _derivadas(eq_dxdt, eq_dydt, x + dt / 2 * k1x, y + dt / 2 * k1y)
+            k3x, k3y = _derivadas(eq_dxdt, eq_dydt, x + dt / 2 * k2x, y + dt / 2 * k2y)
+            k4x, k4y = _derivadas(eq_dxdt, eq_dydt, x + dt * k3x, y + dt * k3y)
+
+            x = x + dt / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+            y = y + dt / 6 * (k1y + 2 * k2y + 2 * k3y + k4y)
+
+            fuera = ~(np.abs(x) <= limite[0]) | ~(np.abs(y) <= limite[1])
+            x[fuera] = np.nan
+            y[fuera] = np.nan
+
+            if k % guardar_cada == 0:
+                X[k // guardar_cada], Y[k // guardar_cada] = x, y
+
+    # pasado invertido + semilla + futuro
+    adelante_x, atras_x = X[:, :n].T, X[:, n:].T
+    adelante_y, atras_y = Y[:, :n].T, Y[:, n:].T
+
+    return (np.hstack([atras_x[:, :0:-1], adelante_x]),
+            np.hstack([atras_y[:, :0:-1], adelante_y]))
+
+
+@lru_cache(maxsize=32)
+def calcular_trayectorias(eq_dxdt, eq_dydt, range_x, range_y, semillas, t_final,
+                          pasos=400, max_puntos=MAX_PUNTOS_TRAYECTORIAS):
+    """
+    Siembra ~`semillas` puntos en una malla regular del dominio e integra
+    todas las trayectorias juntas. Memorizado como evaluar_campo.
+
+    La integración usa siempre `pasos` pasos; lo que se guarda se ralea
+    (uno de cada 4 pasos como mínimo) para no pasar de `max_puntos` en total.
+    """
+    lado = max(2, math.ceil(math.sqrt(semillas)))
+    x0, y0 = np.meshgrid(np.linspace(-range_x, range_x, lado), np.linspace(-range_y, range_y, lado))
+    x0, y0 = x0.ravel(), y0.ravel()
+
+    # puntos por semilla = 2 * pasos // guardar_cada + 1
+    guardar_cada = max(4, math.ceil(2 * pasos * len(x0) / max_puntos))
+
+    # margen para que las órbitas que rozan el borde no se corten
+    limite = (range_x * 1.5, range_y * 1.5)
+    X, Y = integrar_trayectorias(eq_dxdt, eq_dydt, x0, y0, t_final, pasos, limite, guardar_cada)
+
+    for arreglo in (x0, y0, X, Y):
+        arreglo.flags.writeable = False
+
+    return x0, y0, X, Y
+
+
+def figura_trayectorias(x0, y0, X, Y, range_x, range_y):
+    """Todas las trayectorias en una sola traza Scattergl (cortes con NaN)."""
+    # float32 basta para dibujar y la respuesta pesa la mitad
+    cortes = np.full((X.shape[0], 1), np.nan, dtype=np.float32)
+    xs = np.hstack([X.astype(np.float32), cortes]).ravel()
+    ys = np.hstack([Y.astype(np.float32), cortes]).ravel()
+
+    # de cada racha de NaN (tramos fuera del dominio) basta uno como corte
+    finito = np.isfinite(xs)
+    conservar = finito | np.concatenate([[True], finito[:-1]])
+    xs, ys = xs[conservar], ys[conservar]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(x=xs, y=ys, mode="lines", line=dict(width=1, color="blue"),
+                               connectgaps=False, hoverinfo="skip", name="Trayectorias"))
+    fig.add_trace(go.Scattergl(x=x0.astype(np.float32), y=y0.astype(np.float32), mode="markers",
+                               marker=dict(size=3, color="red"), name="Semillas"))
+
+    fig.update_layout(
+        xaxis=dict(range=[-range_x, range_x], scaleanchor="y"),
+        yaxis=dict(range=[-range_y, range_y]),
+        plot_bgcolor="white",
+        uirevision=f"{range_x}:{range_y}"
+    )
+
+    return fig
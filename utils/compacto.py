@@ -0,0 +1,124 @@
+# utils/compacto.py
+import base64
+import importlib.util
+import os
+
+import numpy as np
+import plotly.io as pio
+
+# ============================================================
+# FIGURAS COMPACTAS (opcional: TM_FIGURAS_COMPACTAS=1)
+# ============================================================
+# Plotly ya manda los arreglos NumPy como binario (base64) en float64 y las
+# fechas como texto ISO. En modo compacto:
+#   - float64 -> float32 cuando no se nota (ver _cabe_en_f4),
+#   - fechas -> milisegundos desde epoch (float64) con el eje en type="date",
+#   - JSON con orjson para todo el resto de la respuesta (si está instalado).
+COMPACTAR = os.environ.get("TM_FIGURAS_COMPACTAS", "0") == "1"
+
+# error máximo admitido al pasar a float32, relativo al rango (máx - mín) del
+# arreglo: 1e-4 del rango es menos de una décima de píxel en un eje de 1000 px
+TOLERANCIA_F4 = 1e-4
+
+_CAMPOS = ("x", "y", "z", "lat", "lon")
+
+if COMPACTAR and importlib.util.find_spec("orjson") is not None:
+    # sin orjson se queda el motor por defecto de plotly
+    pio.json.config.default_engine = "orjson"
+
+
+def _binario(arreglo):
+    return {"dtype": arreglo.dtype.str[1:], "bdata": base64.b64encode(arreglo.tobytes()).decode("ascii")}
+
+
+def _como_numpy(valor):
+    """ndarray del campo (decodifica {"dtype", "bdata"}); None si no es un arreglo."""
+    if isinstance(valor, dict) and "bdata" in valor:
+        return np.frombuffer(base64.b64decode(valor["bdata"]), dtype=valor["dtype"])
+    if isinstance(valor, np.ndarray):
+        return valor
+    if isinstance(valor, (list, tuple)):
+        arreglo = np.asarray(valor)
+        return arreglo if arreglo.dtype.kind in "fiM" else None
+    return None
+
+
+def _compactar_arreglo(valor):
+    """Devuelve (valor_compacto, es_fecha)."""
+    arreglo = _como_numpy(valor)
+    if arreglo is None or arreglo.ndim != 1:
+        return valor, False
+
+    if arreglo.dtype.kind == "M":
+        ms = arreglo.astype("datetime64[ms]").astype(np.int64).astype(np.float64)
+        ms[np.isnat(arreglo)] = np.nan
+        return _binario(ms), True
+
+    if arreglo.dtype == np.float64:
+        with np.errstate(over="ignore"):  # el desborde lo detecta _cabe_en_f4
+            f4 = arreglo.astype(np.float32)
+        if _cabe_en_f4(arreglo, f4):
+            return _binario(f4), False
+
+    return valor, False
+
+
+def _cabe_en_f4(arreglo, f4):
+    """
+    True si float32 no cambia lo que se ve ni lo que se lee en el hover:
+      - ningún valor finito desborda a inf,
+      - arreglos de enteros (conteos acumulados) se conservan exactos
+        (float32 sólo los representa hasta 2**24 ≈ 16,7 millones),
+      - el resto, con error <= TOLERANCIA_F4 * rango: un arreglo con valores
+        grandes y variaciones chicas (p. ej. 1000.000 a 1000.001) no se reduce.
+    """
+    finitos = np.isfinite(arreglo)
+    if not np.array_equal(np.isfinite(f4), finitos):
+        return False
+
+    valores = arreglo[finitos]
+    if valores.size == 0:
+        return True
+
+    error = np.abs(valores - f4[finitos].astype(np.float64))
+    if np.all(valores == np.round(valores)):
+        return not error.any()
+
+    rango = valores.max() - valores.min()
+    if rango == 0:
+        rango = np.abs(valores).max()
+    return error.max() <= TOLERANCIA_F4 * rango
+
+
+def compactar_figura(figura):
+    """
+    Versión compacta (dict) de una figura Plotly o de su dict.
+    Con COMPACTAR desactivado devuelve `figura` sin tocar.
+    """
+    if not COMPACTAR:
+        return figura
+
+    if hasattr(figura, "to_plotly_json"):
+        figura = figura.to_plotly_json()
+    figura = dict(figura)
+
+    datos, ejes_fecha = [], set()
+    for traza in figura.get("data", []):
+        traza = dict(traza)
+        for campo in _CAMPOS:
+            if campo in traza:
+                traza[campo], es_fecha = _compactar_arreglo(traza[campo])
+                if es_fecha and campo in ("x", "y"):
+                    # "x2" -> "xaxis2"
+                    eje = traza.get(f"{campo}axis", campo)
+                    ejes_fecha.add(f"{campo}axis{eje[1:]}")
+        datos.append(traza)
+    figura["data"] = datos
+
+    if ejes_fecha:
+        layout = dict(figura.get("layout", {}))
+        for eje in ejes_fecha:
+            layout[eje] = {**layout.get(eje, {}), "type": "date"}
+        figura["layout"] = layout
+
+    return figura
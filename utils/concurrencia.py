@@ -0,0 +1,93 @@
+# utils/concurrencia.py
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import http
+
+# ============================================================
+# POOL ACOTADO PARA LLAMADAS A APIs EXTERNAS
+# ============================================================
+# Compartido por todos los callbacks del proceso: nunca hay más de
+# TM_HILOS_UPSTREAM peticiones salientes a la vez por worker.
+# Se crea en el primer uso de cada proceso: un worker creado con fork
+# (gunicorn --preload) hereda el objeto del padre pero no sus hilos.
+HILOS_UPSTREAM = int(os.environ.get("TM_HILOS_UPSTREAM", 8))
+
+_pool = None
+_lock_pool = threading.Lock()
+
+
+def _obtener_pool():
+    global _pool
+    with _lock_pool:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=HILOS_UPSTREAM, thread_name_prefix="upstream")
+        return _pool
+
+
+def _tras_fork():
+    global _pool, _lock_pool
+    _pool = None
+    _lock_pool = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_tras_fork)
+
+
+def lanzar(funcion, *args):
+    """Envía funcion(*args) al pool y devuelve el Future (con su hora de inicio)."""
+    futuro = _obtener_pool().submit(_con_medicion, http.medicion_actual(), funcion, *args)
+    futuro.inicio = time.monotonic()
+    return futuro
+
+
+def _con_medicion(acumulador, funcion, *args):
+    # el tiempo de APIs de la tarea se suma al callback que la lanzó
+    if acumulador is None:
+        return funcion(*args)
+
+    http.medir_upstream(acumulador)
+    try:
+        return funcion(*args)
+    finally:
+        http.dejar_de_medir()
+
+
+def esperar(futuro, plazo):
+    """
+    Espera el resultado hasta `plazo` segundos contados desde que se lanzó.
+    Devuelve (resultado, None) o (None, excepción); TimeoutError si venció.
+    Una tarea vencida sigue corriendo en el pool y deja su resultado en
+    caché para la próxima vez.
+    """
+    restante = max(0.0, plazo - (time.monotonic() - futuro.inicio))
+    try:
+        return futuro.result(timeout=restante), None
+    except Exception as e:  # incluye TimeoutError
+        return None, e
+
+
+def en_paralelo(tareas):
+    """
+    Ejecuta tareas independientes a la vez y espera a cada una sólo hasta su plazo.
+
+    tareas: {nombre: (plazo_segundos, funcion, *args)}
+    Devuelve (resultados, fallos) indexados por nombre. Como todas arrancan
+    juntas, la latencia total es la de la más lenta (o su plazo), no la suma.
+    """
+    futuros = {
+        nombre: (plazo, lanzar(funcion, *args))
+        for nombre, (plazo, funcion, *args) in tareas.items()
+    }
+
+    resultados, fallos = {}, {}
+    for nombre, (plazo, futuro) in futuros.items():
+        resultado, error = esperar(futuro, plazo)
+        if error is None:
+            resultados[nombre] = resultado
+        else:
+            fallos[nombre] = error
+
+    return resultados, fallos
@@ -1,6 +1,12 @@
+import os
+
 import plotly.graph_objects as go
 import numpy as np
 
+# Con "1" (por defecto) las páginas del modelo logístico recalculan P(t) en el
+# navegador (assets/js/logistica.js); el servidor sólo arma la figura inicial.
+LOGISTICA_EN_NAVEGADOR = os.environ.get("TM_LOGISTICA_NAVEGADOR", "1") == "1"
+
 def grafica_logistica(p0, r, k, t_max):
 
     t = np.linspace(0, t_max, 100)
@@ -211,12 +217,26 @@ def grafica_seir(t, S, E, I, R):
         margin=dict(t=60, b=40, l=50, r=40)
     )
 
+    return fig
+
 # utils/funciones.py
+import math
+import os
+import threading
+import time
+
 import requests
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
 
+from utils import http
+from utils.almacen import leer_covid, guardar_covid, COVID_TTL
+from utils.muestreo import indices_lttb
+
+# La foto global de /countries (lista, mapa) se renueva cada 10 min como máximo
+GLOBAL_TTL = float(os.environ.get("TM_GLOBAL_TTL", 10 * 60))
+
 # ---------------------------
 # Datos históricos (por país)
 # ---------------------------
@@ -224,9 +244,74 @@ def obtener_datos_covid(pais, lastdays="all"):
     """
     Devuelve DataFrame con columnas: fecha (datetime), casos, muertes, recuperados, nuevos, nuevas_muertes
     Usa disease.sh: /historical/{pais}?lastdays=all
+
+    La serie completa se guarda en el almacén local (utils/almacen.py) y se
+    reutiliza mientras tenga menos de COVID_TTL segundos. Al vencer sólo se
+    piden los días transcurridos desde la última descarga (lastdays=N) y se
+    anexan; si disease.sh falla se sirve la última copia guardada.
+    """
+    df, edad = leer_covid(pais)
+
+    if df is None or df.empty:
+        df = _descarga_completa(pais)
+    elif edad >= COVID_TTL:
+        try:
+            df = _actualizar_cola(pais, df, edad)
+        except (requests.RequestException, KeyError, ValueError, TypeError):
+            # caída o respuesta con otro formato: se sigue con la copia guardada
+            pass
+
+    if df is None:
+        return None
+
+    if lastdays != "all":
+        df = df.tail(int(lastdays)).reset_index(drop=True)
+
+    return df
+
+
+def _descarga_completa(pais):
+    df = _descargar_datos_covid(pais)
+    if df is not None:
+        guardar_covid(pais, df)
+    return df
+
+
+def _actualizar_cola(pais, df, edad):
     """
-    url = f"https://disease.sh/v3/covid-19/historical/{pais}?lastdays={lastdays}"
-    r = requests.get(url, timeout=10)
+    Descarga sólo la cola que falta y la une a la serie guardada.
+    Se piden los días transcurridos desde la última descarga + 1 de solape,
+    así el primer día nuevo tiene contra qué calcular su diferencia.
+    """
+    dias = math.ceil(edad / 86400) + 1
+    cola = _descargar_datos_covid(pais, lastdays=dias)
+    if cola is None or cola.empty:
+        return df
+
+    ultimo = df["fecha"].iloc[-1]
+    if cola["fecha"].iloc[0] > ultimo:
+        # la cola no se solapa con lo guardado (hueco): mejor bajar todo;
+        # si eso no llega, queda lo guardado
+        completa = _descarga_completa(pais)
+        return df if completa is None else completa
+
+    nuevas = cola[cola["fecha"] > ultimo]
+
+    # nuevos / nuevas_muertes sólo para las filas anexadas
+    tramo = pd.concat([df.tail(1), nuevas], ignore_index=True)
+    tramo["nuevos"] = tramo["casos"].diff().fillna(0).astype(int)
+    tramo["nuevas_muertes"] = tramo["muertes"].diff().fillna(0).astype(int)
+    nuevas = tramo.iloc[1:]
+
+    # aunque no haya días nuevos se guarda, para renovar la hora de descarga
+    guardar_covid(pais, nuevas, reemplazar=False)
+
+    return pd.concat([df, nuevas], ignore_index=True)
+
+
+def _descargar_datos_covid(pais, lastdays="all"):
+    url = f"{http.DISEASE_SH_URL}/v3/covid-19/historical/{pais}?lastdays={lastdays}"
+    r = http.get("covid-historico", url)
 
     if r.status_code != 200:
         # algunos países devuelven 404 o estructura distinta -> manejar desde el caller
@@ -264,30 +349,83 @@ def obtener_datos_covid(pais, lastdays="all"):
     return df
 
 # ---------------------------
-# Lista de países con coordenadas y casos (global)
+# Foto global (una sola descarga de /countries para lista, tabla y mapa)
 # ---------------------------
-def obtener_lista_paises():
-    """
-    Retorna lista de nombres de países (ordenada).
-    """
-    url = "https://disease.sh/v3/covid-19/countries"
-    r = requests.get(url, timeout=10)
-    if r.status_code != 200:
-        return []
-    data = r.json()
-    return sorted([x.get("country", "") for x in data if x.get("country")])
+_COLUMNAS_GLOBALES = ["country", "cases", "deaths", "recovered", "lat", "long"]
 
+_snapshot_global = {"datos": None, "hora": 0.0}
+_lock_global = threading.Lock()
 
-def obtener_datos_globales_dataframe():
+
+def _tras_fork():
+    # si el padre estaba renovando la foto, el hijo heredaría el lock tomado para siempre
+    global _lock_global
+    _lock_global = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_tras_fork)
+
+
+def obtener_snapshot_global():
     """
-    Retorna DataFrame con columnas: country, cases, deaths, recovered, lat, long
-    Usado para el mapa.
+    Devuelve dict con 'paises' (lista ordenada), 'df' (tabla para el mapa) y
+    'mapa' (figura ya construida), compartido por todo el proceso.
+
+    Se descarga como máximo una vez cada GLOBAL_TTL segundos. Vencida la foto
+    se sigue sirviendo la anterior mientras un solo hilo de fondo la renueva;
+    sólo se espera la descarga cuando todavía no hay ninguna (y aun así un
+    único hilo descarga y los demás esperan). Si la descarga falla se mantiene
+    la foto anterior.
     """
-    url = "https://disease.sh/v3/covid-19/countries"
-    r = requests.get(url, timeout=10)
+    datos = _snapshot_global["datos"]
+    if datos is not None:
+        vencida = time.time() - _snapshot_global["hora"] >= GLOBAL_TTL
+        if vencida and _lock_global.acquire(blocking=False):
+            threading.Thread(target=_renovar_snapshot_global, name="snapshot-global", daemon=True).start()
+        return datos
+
+    with _lock_global:
+        if _snapshot_global["datos"] is None:
+            _descargar_y_guardar_snapshot()
+        return _snapshot_global["datos"] or _snapshot_vacio()
+
+
+def _renovar_snapshot_global():
+    # corre con _lock_global ya tomado por quien lanzó el hilo
+    try:
+        _descargar_y_guardar_snapshot()
+    finally:
+        _lock_global.release()
+
+
+def _descargar_y_guardar_snapshot():
+    try:
+        nuevo = _descargar_snapshot_global()
+    except requests.RequestException:
+        nuevo = None
+
+    if nuevo is not None:
+        _snapshot_global["datos"] = nuevo
+        _snapshot_global["hora"] = time.time()
+
+
+def _snapshot_vacio():
+    return {
+        "paises": [],
+        "df": pd.DataFrame(columns=_COLUMNAS_GLOBALES),
+        "mapa": go.Figure()
+    }
+
+
+def _descargar_snapshot_global():
+    url = f"{http.DISEASE_SH_URL}/v3/covid-19/countries"
+    r = http.get("covid-paises", url)
     if r.status_code != 200:
-        return pd.DataFrame(columns=["country","cases","deaths","recovered","lat","long"])
+        return None
     data = r.json()
+
+    paises = sorted([x.get("country", "") for x in data if x.get("country")])
+
     df = pd.DataFrame([{
         "country": c.get("country"),
         "cases": c.get("cases", 0),
@@ -295,17 +433,37 @@ def obtener_datos_globales_dataframe():
         "recovered": c.get("recovered", 0),
         "lat": c.get("countryInfo", {}).get("lat", None),
         "long": c.get("countryInfo", {}).get("long", None)
-    } for c in data])
+    } for c in data], columns=_COLUMNAS_GLOBALES)
     # filtrar sin coordenadas
     df = df.dropna(subset=["lat","long"]).reset_index(drop=True)
-    return df
+
+    return {"paises": paises, "df": df, "mapa": _construir_mapa_covid(df)}
+
+
+# ---------------------------
+# Lista de países con coordenadas y casos (global)
+# ---------------------------
+def obtener_lista_paises():
+    """
+    Retorna lista de nombres de países (ordenada).
+    """
+    return obtener_snapshot_global()["paises"]
+
+
+def obtener_datos_globales_dataframe():
+    """
+    Retorna DataFrame con columnas: country, cases, deaths, recovered, lat, long
+    Usado para el mapa.
+    """
+    return obtener_snapshot_global()["df"]
 
 # ---------------------------
 # Gráfica de series (estilo SIR/SEIR)
 # ---------------------------
-def figura_lineal_covid(df, pais, t_max=None):
+def figura_lineal_covid(df, pais, t_max=None, max_puntos=None):
     """
     Recibe df con 'fecha','casos','muertes','recuperados' y devuelve figura Plotly estilizada.
+    Con max_puntos cada serie se reduce con LTTB (misma forma, muchos menos puntos).
     """
     fig = go.Figure()
 
@@ -320,21 +478,32 @@ def figura_lineal_covid(df, pais, t_max=None):
         )
         return fig
 
+    def serie(columna):
+        if max_puntos is None:
+            return df["fecha"], df[columna]
+        # días desde epoch como eje x del triángulo
+        dias = df["fecha"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+        indices = indices_lttb(dias, df[columna].to_numpy(), max_puntos)
+        return df["fecha"].iloc[indices], df[columna].iloc[indices]
+
     # trazas
+    x, y = serie("casos")
     fig.add_trace(go.Scatter(
-        x=df["fecha"], y=df["casos"], mode="lines", name="Casos Totales",
+        x=x, y=y, mode="lines", name="Casos Totales",
         line=dict(color="orange", width=3)
     ))
 
+    x, y = serie("muertes")
     fig.add_trace(go.Scatter(
-        x=df["fecha"], y=df["muertes"], mode="lines", name="Muertes Totales",
+        x=x, y=y, mode="lines", name="Muertes Totales",
         line=dict(color="red", width=3)
     ))
 
     # opcional: recuperados si existen
     if "recuperados" in df.columns:
+        x, y = serie("recuperados")
         fig.add_trace(go.Scatter(
-            x=df["fecha"], y=df["recuperados"], mode="lines", name="Recuperados",
+            x=x, y=y, mode="lines", name="Recuperados",
             line=dict(color="green", width=2, dash="dash")
         ))
 
@@ -356,7 +525,9 @@ def figura_lineal_covid(df, pais, t_max=None):
         yaxis=dict(showgrid=True, gridcolor="lightgrey"),
         height=430,
         margin=dict(t=60, b=40, l=50, r=40),
-        legend=dict(x=0.02, y=0.98)
+        legend=dict(x=0.02, y=0.98),
+        # conserva el zoom del usuario cuando llega el detalle del tramo
+        uirevision=pais
     )
     return fig
 
@@ -364,7 +535,11 @@ def figura_lineal_covid(df, pais, t_max=None):
 # Mapa global (burbuja) — usa la misma fuente y colores
 # ---------------------------
 def mapa_covid_global():
-    df = obtener_datos_globales_dataframe()
+    """Figura del mapa ya construida con la foto global (no vuelve a descargar)."""
+    return obtener_snapshot_global()["mapa"]
+
+
+def _construir_mapa_covid(df):
     if df is None or df.empty:
         return go.Figure()
 
@@ -410,65 +585,74 @@ def mapa_covid_global():
     )
 
     return fig
-import requests
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from functools import lru_cache
-
-# ============================================================
-# SESIÓN GLOBAL DE REQUESTS (acelera x4)
-# ============================================================
-session = requests.Session()
+from collections import OrderedDict
 
+from utils.almacen import leer_clima, guardar_clima, CLIMA_TTL
+from utils.concurrencia import en_paralelo
 
 # ============================================================
-# API: Países SIN clima (rápido)
+# API: Clima Open-Meteo cacheado
 # ============================================================
-def get_countries():
-    """
-    Carga lista de países desde RESTCountries sin pedir clima.
-    Evita 250 llamadas API lentas. Ultra rápido (<200ms).
-    """
-    url = "https://restcountries.com/v3.1/all?fields=name,latlng"
-    r = session.get(url, timeout=10)
+# 0.1° ≈ 11 km: más fino que la malla de Open-Meteo, así coordenadas casi
+# iguales comparten entrada
+DECIMALES_COORD = 1
 
-    if r.status_code != 200:
-        return pd.DataFrame(columns=["country", "lat", "lon"])
-
-    data = r.json()
-    rows = []
-
-    for c in data:
-        if "latlng" not in c or len(c["latlng"]) < 2:
-            continue
-        rows.append({
-            "country": c["name"]["common"],
-            "lat": c["latlng"][0],
-            "lon": c["latlng"][1]
-        })
-
-    df = pd.DataFrame(rows)
-    df = df.sort_values("country")
-    return df
+# Copia pequeña en memoria delante de SQLite: {(lat, lon): (hora, df)}
+_clima_memoria = OrderedDict()
+_clima_lock = threading.Lock()
+CLIMA_MEMORIA_MAX = 32
 
 
-# ============================================================
-# API: Clima Open-Meteo cacheado
-# ============================================================
-@lru_cache(maxsize=300)
 def get_weather(lat, lon):
     """
     Consulta Open-Meteo y devuelve temperaturas horarias.
-    Cacheado por país (rápido en 50 ms).
+
+    Cacheado por coordenada redondeada durante CLIMA_TTL (1 h): primero en
+    memoria (acotada) y luego en el SQLite compartido por los workers, así
+    los pronósticos se renuevan y no se duplican por proceso. Si la API
+    falla se devuelve la última copia guardada aunque esté vencida.
     """
+    lat = round(float(lat), DECIMALES_COORD)
+    lon = round(float(lon), DECIMALES_COORD)
+    clave = (lat, lon)
 
+    with _clima_lock:
+        guardado = _clima_memoria.get(clave)
+        if guardado is not None and time.time() - guardado[0] < CLIMA_TTL:
+            _clima_memoria.move_to_end(clave)
+            return guardado[1]
+
+    df, edad = leer_clima(lat, lon)
+    hora = time.time() - (edad or 0)
+
+    if df is None or edad >= CLIMA_TTL:
+        try:
+            df = _descargar_clima(lat, lon)
+            hora = time.time()
+            guardar_clima(lat, lon, df)
+        except (requests.RequestException, KeyError, ValueError):
+            if df is None:
+                raise
+
+    with _clima_lock:
+        _clima_memoria[clave] = (hora, df)
+        _clima_memoria.move_to_end(clave)
+        while len(_clima_memoria) > CLIMA_MEMORIA_MAX:
+            _clima_memoria.popitem(last=False)
+
+    return df
+
+
+def _descargar_clima(lat, lon):
     url = (
-        "https://api.open-meteo.com/v1/forecast?"
+        f"{http.OPEN_METEO_URL}/v1/forecast?"
         f"latitude={lat}&longitude={lon}&hourly=temperature_2m"
     )
 
-    r = session.get(url, timeout=10).json()
+    r = http.get("open-meteo", url).json()
 
     hours = r["hourly"]["time"]
     temps = r["hourly"]["temperature_2m"]
@@ -479,6 +663,89 @@ def get_weather(lat, lon):
     return df
 
 
+# ============================================================
+# API: Temperatura actual de muchos países (por lotes)
+# ============================================================
+# Open-Meteo acepta listas latitude=a,b,...&longitude=c,d,...; con 100
+# coordenadas por petición los ~250 países salen en 3 llamadas en paralelo
+TAMANO_LOTE = 100
+PLAZO_LOTE = 8
+
+# {(lat, lon): (hora, temperatura)}, acotada como _clima_memoria: la tabla de
+# países trae ~250 coordenadas, el tope sólo protege de tablas arbitrarias
+_temperaturas = OrderedDict()
+_temperaturas_lock = threading.Lock()
+TEMPERATURAS_MAX = 1024
+
+
+def _descargar_lote(coordenadas):
+    url = (
+        f"{http.OPEN_METEO_URL}/v1/forecast?"
+        f"latitude={','.join(str(lat) for lat, _ in coordenadas)}&"
+        f"longitude={','.join(str(lon) for _, lon in coordenadas)}&"
+        f"current=temperature_2m"
+    )
+    r = http.get("open-meteo-lote", url)
+    r.raise_for_status()
+
+    datos = r.json()
+    if isinstance(datos, dict):  # con una sola coordenada no viene lista
+        datos = [datos]
+
+    return [d["current"]["temperature_2m"] for d in datos]
+
+
+def temperaturas_actuales(df):
+    """
+    Devuelve una copia de df (country/lat/lon, p. ej. registro().tabla()) con
+    la columna "temperature" (temperatura actual, °C).
+
+    Las temperaturas quedan en memoria por coordenada redondeada durante
+    CLIMA_TTL: sólo las que faltan o vencieron se piden, en lotes de
+    TAMANO_LOTE lanzados a la vez (en memoria quedan a lo sumo
+    TEMPERATURAS_MAX, las menos usadas salen primero). Si un lote falla sus
+    países conservan la última temperatura conocida, o NaN si no la hay.
+    """
+    coordenadas = [
+        (round(float(lat), DECIMALES_COORD), round(float(lon), DECIMALES_COORD))
+        for lat, lon in zip(df["lat"], df["lon"])
+    ]
+
+    ahora = time.time()
+    with _temperaturas_lock:
+        conocidas = {c: _temperaturas[c] for c in set(coordenadas) if c in _temperaturas}
+    faltan = list(dict.fromkeys(
+        c for c in coordenadas
+        if c not in conocidas or ahora - conocidas[c][0] >= CLIMA_TTL
+    ))
+
+    lotes = [faltan[i:i + TAMANO_LOTE] for i in range(0, len(faltan), TAMANO_LOTE)]
+    resultados, _ = en_paralelo({
+        i: (PLAZO_LOTE, _descargar_lote, lote) for i, lote in enumerate(lotes)
+    })
+
+    nuevas = {
+        coordenada: (ahora, temperatura)
+        for i, temperaturas in resultados.items()
+        for coordenada, temperatura in zip(lotes[i], temperaturas)
+    }
+    conocidas.update(nuevas)
+
+    with _temperaturas_lock:
+        _temperaturas.update(nuevas)
+        for coordenada in conocidas:
+            if coordenada in _temperaturas:
+                _temperaturas.move_to_end(coordenada)
+        while len(_temperaturas) > TEMPERATURAS_MAX:
+            _temperaturas.popitem(last=False)
+
+    df = df.copy()
+    df["temperature"] = [
+        conocidas[c][1] if c in conocidas else np.nan for c in coordenadas
+    ]
+    return df
+
+
 # ============================================================
 # Gráfico de Líneas
 # ============================================================
@@ -512,19 +779,32 @@ def clima_line_plot(df, country):
 # ============================================================
 def clima_world_map(df):
     """
-    Mapa global simple (solo posiciones), NO usa sensación térmica.
-    rápido y suficiente para mostrar países.
+    Mapa global de países. Si df trae la columna "temperature"
+    (ver temperaturas_actuales) los puntos se colorean por temperatura.
     """
-
-    fig = px.scatter_geo(
-        df,
-        lat="lat",
-        lon="lon",
-        hover_name="country",
-        opacity=0.6,
-        projection="natural earth",
-        title="Mapa Mundial (Ubicación de Países)"
-    )
+    if "temperature" in df and df["temperature"].notna().any():
+        fig = px.scatter_geo(
+            df,
+            lat="lat",
+            lon="lon",
+            hover_name="country",
+            color="temperature",
+            color_continuous_scale="RdYlBu_r",
+            labels={"temperature": "°C"},
+            opacity=0.8,
+            projection="natural earth",
+            title="Mapa Mundial (Temperatura Actual)"
+        )
+    else:
+        fig = px.scatter_geo(
+            df,
+            lat="lat",
+            lon="lon",
+            hover_name="country",
+            opacity=0.6,
+            projection="natural earth",
+            title="Mapa Mundial (Ubicación de Países)"
+        )
 
     fig.update_layout(
         margin=dict(l=0, r=0, t=40, b=0),
@@ -0,0 +1,125 @@
+# utils/http.py
+import os
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ============================================================
+# URLs BASE (se pueden apuntar a un servidor local de pruebas)
+# ============================================================
+DISEASE_SH_URL = os.environ.get("TM_DISEASE_SH_URL", "https://disease.sh").rstrip("/")
+RESTCOUNTRIES_URL = os.environ.get("TM_RESTCOUNTRIES_URL", "https://restcountries.com").rstrip("/")
+OPEN_METEO_URL = os.environ.get("TM_OPEN_METEO_URL", "https://api.open-meteo.com").rstrip("/")
+
+TIMEOUT = 10
+
+
+# ============================================================
+# SESIÓN COMPARTIDA (pool por host, keep-alive, gzip, reintentos)
+# ============================================================
+def _crear_sesion():
+    reintentos = Retry(
+        total=3,
+        backoff_factor=0.3,  # 0.3 s, 0.6 s, 1.2 s
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    # pool_connections = hosts con pool propio; pool_maxsize = conexiones vivas por host
+    adaptador = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=int(os.environ.get("TM_HILOS_UPSTREAM", 8)),
+        max_retries=reintentos
+    )
+
+    sesion = requests.Session()
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    sesion.headers.update({"Accept-Encoding": "gzip, deflate", "Accept": "application/json"})
+    return sesion
+
+
+sesion = _crear_sesion()
+
+
+# ============================================================
+# MÉTRICAS POR ENDPOINT
+# ============================================================
+_lock = threading.Lock()
+_metricas = defaultdict(lambda: {
+    "peticiones": 0, "errores": 0, "segundos": 0.0, "bytes": 0, "bytes_red": 0
+})
+
+
+# Tiempo de APIs externas de la petición en curso (ver medir_upstream). Es
+# por hilo; concurrencia.lanzar lo propaga a los hilos del pool.
+_local = threading.local()
+
+
+def medicion_actual():
+    """Acumulador {"peticiones", "segundos"} del hilo actual (None si no se mide)."""
+    return getattr(_local, "acumulador", None)
+
+
+def medir_upstream(acumulador=None):
+    """
+    Empieza a acumular en este hilo el tiempo de las llamadas a APIs.
+    Sin argumento crea un acumulador nuevo; con uno existente lo comparte
+    (así las tareas del pool suman al de la petición que las lanzó).
+    Devuelve el acumulador; None deja de medir.
+    """
+    if acumulador is None:
+        acumulador = {"peticiones": 0, "segundos": 0.0}
+    _local.acumulador = acumulador
+    return acumulador
+
+
+def dejar_de_medir():
+    _local.acumulador = None
+
+
+def _registrar(endpoint, segundos, respuesta=None):
+    acumulador = medicion_actual()
+    with _lock:
+        if acumulador is not None:
+            acumulador["peticiones"] += 1
+            acumulador["segundos"] += segundos
+
+        m = _metricas[endpoint]
+        m["peticiones"] += 1
+        m["segundos"] += segundos
+
+        if respuesta is None or respuesta.status_code >= 400:
+            m["errores"] += 1
+        if respuesta is not None:
+            m["bytes"] += len(respuesta.content)
+            # lo que viajó por la red (comprimido, si el servidor usó gzip)
+            m["bytes_red"] += int(respuesta.headers.get("Content-Length", len(respuesta.content)))
+
+
+def metricas():
+    """Copia de los contadores: {endpoint: {peticiones, errores, segundos, bytes, bytes_red}}."""
+    with _lock:
+        return {endpoint: dict(m) for endpoint, m in _metricas.items()}
+
+
+def get(endpoint, url, params=None, timeout=TIMEOUT):
+    """
+    GET con la sesión compartida. `endpoint` es un nombre corto para las
+    métricas ("covid-historico", "open-meteo", ...). Los errores de red se
+    propagan como requests.RequestException, igual que con requests.get.
+    """
+    inicio = time.perf_counter()
+    try:
+        respuesta = sesion.get(url, params=params, timeout=timeout)
+    except requests.RequestException:
+        _registrar(endpoint, time.perf_counter() - inicio)
+        raise
+
+    _registrar(endpoint, time.perf_counter() - inicio, respuesta)
+    return respuesta
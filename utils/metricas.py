@@ -0,0 +1,163 @@
+# utils/metricas.py
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, g, request
+
+from utils import http
+
+# ============================================================
+# MÉTRICAS POR CALLBACK (latencia, tiempo en APIs y de cómputo, bytes)
+# ============================================================
+# Cada POST a /_dash-update-component es un callback; se identifica por su
+# output ("grafico-covid.figure", o "..a.figure...b.children.." si son varios).
+# Los contadores son por proceso: con varios workers, Prometheus los suma.
+# El output lo manda el cliente: sólo se usa como etiqueta si es un callback
+# registrado en la app (si no, "desconocido"), así un POST arbitrario no crea
+# series nuevas.
+# El cómputo es la latencia menos la espera a APIs; si las APIs se llamaron
+# en paralelo su suma puede superar la latencia y el cómputo de esa
+# llamada cuenta 0.
+CUBETAS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_app = None
+_callbacks = defaultdict(lambda: {
+    "cubetas": [0] * len(CUBETAS),
+    "cantidad": 0,
+    "segundos": 0.0,
+    "upstream_segundos": 0.0,
+    "upstream_peticiones": 0,
+    "computo_segundos": 0.0,
+    "peticion_bytes": 0,
+    "bytes": 0,
+    "errores": 0
+})
+
+
+def _es_callback():
+    return request.method == "POST" and request.path.endswith("/_dash-update-component")
+
+
+def _antes():
+    if _es_callback():
+        g.tm_inicio = time.perf_counter()
+        g.tm_upstream = http.medir_upstream()
+
+
+def _despues(respuesta):
+    inicio = g.pop("tm_inicio", None)
+    if inicio is None:
+        return respuesta
+
+    segundos = time.perf_counter() - inicio
+    upstream = g.pop("tm_upstream")
+    http.dejar_de_medir()
+
+    cuerpo = request.get_json(silent=True) or {}
+    output = cuerpo.get("output")
+    if not isinstance(output, str) or output not in _app.callback_map:
+        output = "desconocido"
+    tam = 0 if respuesta.direct_passthrough else len(respuesta.get_data())
+    tam_peticion = request.content_length
+    if tam_peticion is None:
+        tam_peticion = len(request.get_data())
+
+    with _lock:
+        m = _callbacks[output]
+        m["cantidad"] += 1
+        m["segundos"] += segundos
+        m["upstream_segundos"] += upstream["segundos"]
+        m["upstream_peticiones"] += upstream["peticiones"]
+        m["computo_segundos"] += max(0.0, segundos - upstream["segundos"])
+        m["peticion_bytes"] += tam_peticion
+        m["bytes"] += tam
+        # 204 = PreventUpdate; sólo los 4xx/5xx son errores
+        if respuesta.status_code >= 400:
+            m["errores"] += 1
+        for i, limite in enumerate(CUBETAS):
+            if segundos <= limite:
+                m["cubetas"][i] += 1
+
+    return respuesta
+
+
+def metricas_callbacks():
+    """Copia de los contadores por output."""
+    with _lock:
+        return {output: {**m, "cubetas": list(m["cubetas"])} for output, m in _callbacks.items()}
+
+
+# ============================================================
+# FORMATO PROMETHEUS
+# ============================================================
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def exposicion():
+    """Texto en formato de exposición de Prometheus (0.0.4)."""
+    lineas = []
+
+    def metrica(nombre, tipo, ayuda):
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+
+    callbacks = metricas_callbacks()
+
+    metrica("tm_callback_segundos", "histogram", "Latencia de los callbacks Dash por output")
+    for output, m in callbacks.items():
+        etiqueta = f'output="{_etiqueta(output)}"'
+        for limite, cantidad in zip(CUBETAS, m["cubetas"]):
+            lineas.append(f'tm_callback_segundos_bucket{{{etiqueta},le="{limite}"}} {cantidad}')
+        lineas.append(f'tm_callback_segundos_bucket{{{etiqueta},le="+Inf"}} {m["cantidad"]}')
+        lineas.append(f"tm_callback_segundos_sum{{{etiqueta}}} {m['segundos']:.6f}")
+        lineas.append(f"tm_callback_segundos_count{{{etiqueta}}} {m['cantidad']}")
+
+    por_output = [
+        ("tm_callback_upstream_segundos_total", "upstream_segundos",
+         "Tiempo en APIs externas dentro del callback (suma; en paralelo puede superar la latencia)"),
+        ("tm_callback_upstream_peticiones_total", "upstream_peticiones", "Peticiones a APIs externas hechas por el callback"),
+        ("tm_callback_computo_segundos_total", "computo_segundos",
+         "Tiempo del callback fuera de las APIs externas (latencia menos espera a APIs, 0 como mínimo)"),
+        ("tm_callback_peticion_bytes_total", "peticion_bytes", "Bytes de las peticiones al callback (inputs y states)"),
+        ("tm_callback_respuesta_bytes_total", "bytes", "Bytes de las respuestas del callback (sin comprimir)"),
+        ("tm_callback_errores_total", "errores", "Respuestas 4xx/5xx del callback"),
+    ]
+    for nombre, clave, ayuda in por_output:
+        metrica(nombre, "counter", ayuda)
+        for output, m in callbacks.items():
+            valor = m[clave]
+            valor = f"{valor:.6f}" if isinstance(valor, float) else valor
+            lineas.append(f'{nombre}{{output="{_etiqueta(output)}"}} {valor}')
+
+    endpoints = http.metricas()
+    por_endpoint = [
+        ("tm_upstream_peticiones_total", "peticiones", "Peticiones a cada API externa"),
+        ("tm_upstream_errores_total", "errores", "Peticiones fallidas (red o 4xx/5xx) a cada API externa"),
+        ("tm_upstream_segundos_total", "segundos", "Tiempo total esperando a cada API externa"),
+        ("tm_upstream_bytes_total", "bytes", "Bytes recibidos de cada API (descomprimidos)"),
+        ("tm_upstream_bytes_red_total", "bytes_red", "Bytes recibidos de cada API por la red"),
+    ]
+    for nombre, clave, ayuda in por_endpoint:
+        metrica(nombre, "counter", ayuda)
+        for endpoint, m in endpoints.items():
+            valor = m[clave]
+            valor = f"{valor:.6f}" if isinstance(valor, float) else valor
+            lineas.append(f'{nombre}{{endpoint="{_etiqueta(endpoint)}"}} {valor}')
+
+    return "\n".join(lineas) + "\n"
+
+
+def registrar(app, ruta="/metrics"):
+    """Engancha la medición de callbacks al servidor de la app Dash y expone GET /metrics."""
+    global _app
+    _app = app
+    server = app.server
+    server.before_request(_antes)
+    server.after_request(_despues)
+    server.add_url_rule(
+        ruta, "metrics",
+        lambda: Response(exposicion(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+    )
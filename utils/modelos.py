@@ -0,0 +1,153 @@
+# utils/modelos.py
+import numpy as np
+from scipy.integrate import odeint
+
+# ============================================================
+# MODELOS COMPARTIMENTALES
+# ------------------------------------------------------------
+# Todos usan la firma de solve_ivp: f(t, y, *params).
+# y puede ser (n,) o (n, k) -> sirven con vectorized=True.
+# Para odeint pasar tfirst=True.
+# Los jacobianos devuelven (n, n) o (n, n, k) si los
+# parámetros/estados vienen como arreglos.
+# ============================================================
+
+
+# ------------------------------------------------------------
+# SIR:  dS = -βSI/N,  dI = βSI/N - γI,  dR = γI
+# (con N = 1 se obtiene la forma con β por persona: dS = -βSI)
+# ------------------------------------------------------------
+def sir(t, y, beta, gamma, N=1.0):
+    S, I, R = y
+
+    infeccion = beta * S * I / N
+    recuperacion = gamma * I
+
+    return np.array([-infeccion, infeccion - recuperacion, recuperacion])
+
+
+def jac_sir(t, y, beta, gamma, N=1.0):
+    S, I, R = y
+    b = beta / N
+
+    J = np.zeros((3, 3) + np.broadcast(S, I, b, gamma).shape)
+    J[0, 0] = -b * I
+    J[0, 1] = -b * S
+    J[1, 0] = b * I
+    J[1, 1] = b * S - gamma
+    J[2, 1] = gamma
+    return J
+
+
+# ------------------------------------------------------------
+# SEIR: dS = -βSI/N, dE = βSI/N - σE, dI = σE - γI, dR = γI
+# ------------------------------------------------------------
+def seir(t, y, beta, gamma, sigma, N=1.0):
+    S, E, I, R = y
+
+    infeccion = beta * S * I / N
+    incubacion = sigma * E
+    recuperacion = gamma * I
+
+    return np.array([
+        -infeccion,
+        infeccion - incubacion,
+        incubacion - recuperacion,
+        recuperacion
+    ])
+
+
+def jac_seir(t, y, beta, gamma, sigma, N=1.0):
+    S, E, I, R = y
+    b = beta / N
+
+    J = np.zeros((4, 4) + np.broadcast(S, I, b, gamma, sigma).shape)
+    J[0, 0] = -b * I
+    J[0, 2] = -b * S
+    J[1, 0] = b * I
+    J[1, 1] = -sigma
+    J[1, 2] = b * S
+    J[2, 1] = sigma
+    J[2, 2] = -gamma
+    J[3, 2] = gamma
+    return J
+
+
+# ------------------------------------------------------------
+# RUMOR: dS = -bSI, dI = bSI - kIR, dR = kIR
+# ------------------------------------------------------------
+def rumor(t, y, b, k):
+    S, I, R = y
+
+    difusion = b * S * I
+    freno = k * I * R
+
+    return np.array([-difusion, difusion - freno, freno])
+
+
+def jac_rumor(t, y, b, k):
+    S, I, R = y
+
+    J = np.zeros((3, 3) + np.broadcast(S, I, R, b, k).shape)
+    J[0, 0] = -b * I
+    J[0, 1] = -b * S
+    J[1, 0] = b * I
+    J[1, 1] = b * S - k * R
+    J[1, 2] = -k * I
+    J[2, 1] = k * R
+    J[2, 2] = k * I
+    return J
+
+
+# ============================================================
+# SIR EN ENSAMBLE (varios escenarios en una sola integración)
+# ============================================================
+def _sir_ensamble(t, y, b, g):
+    """
+    Lado derecho del SIR para M escenarios a la vez.
+    El estado viene aplanado como [S_1, I_1, R_1, S_2, I_2, R_2, ...].
+    """
+    return sir(t, y.reshape(-1, 3).T, b, g).T.ravel()
+
+
+def _jac_sir_ensamble(t, y, b, g):
+    """
+    Jacobiano en formato de banda de odeint: banda[i - j + mu, j] = df_i/dy_j.
+    Cada escenario aporta su bloque 3x3 en la diagonal.
+    """
+    J = jac_sir(t, y.reshape(-1, 3).T, b, g)
+
+    banda = np.zeros((5, y.size))
+    for i in range(3):
+        for j in range(3):
+            banda[i - j + 2, j::3] = J[i, j]
+    return banda
+
+
+def resolver_sir_ensamble(beta, gamma, y0, t):
+    """
+    Integra M escenarios SIR (dS = -bSI, dI = bSI - gI, dR = gI) como un solo sistema.
+
+    beta, gamma: escalares o arreglos de longitud M.
+    y0: [S0, I0, R0] común a todos o arreglo (M, 3) con uno por escenario.
+    t: malla de tiempos.
+
+    Devuelve un arreglo (M, 3, len(t)); sol[k, 1] es I(t) del escenario k.
+    """
+    beta = np.asarray(beta, dtype=float)
+    gamma = np.asarray(gamma, dtype=float)
+    y0 = np.asarray(y0, dtype=float)
+
+    forma = np.broadcast_shapes(beta.shape, gamma.shape, y0.shape[:-1])
+    m = int(np.prod(forma)) if forma else 1
+
+    b = np.broadcast_to(beta, forma).ravel()
+    g = np.broadcast_to(gamma, forma).ravel()
+    y_ini = np.broadcast_to(y0, forma + (3,)).reshape(m, 3)
+
+    # Cada escenario sólo se acopla consigo mismo: el jacobiano es diagonal
+    # por bloques 3x3, así que basta una banda de ancho 2 (ml = mu = 2).
+    sol = odeint(_sir_ensamble, y_ini.ravel(), t, args=(b, g),
+                 Dfun=_jac_sir_ensamble, ml=2, mu=2, tfirst=True)
+
+    return sol.reshape(len(t), m, 3).transpose(1, 2, 0)
@@ -0,0 +1,62 @@
+# utils/muestreo.py
+import numpy as np
+
+# ============================================================
+# LTTB (Largest-Triangle-Three-Buckets)
+# ============================================================
+# Reduce una serie a n puntos conservando su forma visual: en cada tramo se
+# queda con el punto que forma el triángulo más grande con el elegido en el
+# tramo anterior y el promedio del siguiente (los picos nunca se pierden).
+
+# Un punto cada 4 px es indistinguible de la serie completa en una línea
+PIXELES_POR_PUNTO = 4
+ANCHO_POR_DEFECTO = 900
+
+
+def puntos_para_ancho(ancho_px):
+    """Cantidad de puntos a enviar para un gráfico de `ancho_px` píxeles."""
+    try:
+        ancho = int(ancho_px)
+    except (TypeError, ValueError):
+        ancho = ANCHO_POR_DEFECTO
+    return max(ancho, 200) // PIXELES_POR_PUNTO
+
+
+def indices_lttb(x, y, n_puntos):
+    """
+    Índices (crecientes) de los n_puntos elegidos por LTTB.
+    Siempre conserva el primero y el último. Si la serie ya es corta
+    devuelve todos los índices.
+    """
+    y = np.asarray(y, dtype=float)
+    total = len(y)
+    if n_puntos >= total or n_puntos < 3:
+        return np.arange(total)
+
+    x = np.asarray(x, dtype=float)
+
+    # n_puntos - 2 tramos entre el primer y el último punto
+    bordes = np.linspace(1, total - 1, n_puntos - 1).astype(int)
+
+    indices = np.empty(n_puntos, dtype=np.int64)
+    indices[0], indices[-1] = 0, total - 1
+
+    a = 0
+    for i in range(n_puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+
+        # vértice C: promedio del tramo siguiente (o el último punto)
+        if i + 2 < len(bordes):
+            sig_inicio, sig_fin = bordes[i + 1], bordes[i + 2]
+            xc, yc = x[sig_inicio:sig_fin].mean(), y[sig_inicio:sig_fin].mean()
+        else:
+            xc, yc = x[-1], y[-1]
+
+        # doble del área del triángulo A-B-C para cada candidato B del tramo
+        xa, ya = x[a], y[a]
+        areas = np.abs((xa - xc) * (y[inicio:fin] - ya) - (xa - x[inicio:fin]) * (yc - ya))
+
+        a = inicio + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
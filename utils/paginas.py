@@ -0,0 +1,229 @@
+# utils/paginas.py
+import ast
+import importlib
+import os
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+import dash
+from flask import request
+
+# Partes internas de Dash (probadas con 4.4.x, ver requeriments.txt); si una
+# versión nueva las mueve, mejor fallar al arrancar que con páginas sin callbacks
+try:
+    from dash import _callback
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+except ImportError as e:
+    raise RuntimeError(
+        f"utils/paginas.py necesita internos de Dash 4.4 que dash {dash.__version__} "
+        f"no tiene ({e}); instalar dash>=4.4,<4.5"
+    ) from e
+
+# ============================================================
+# REGISTRO PEREZOSO DE PÁGINAS
+# ============================================================
+# Los metadatos (path, name, order, title...) se leen del
+# dash.register_page(...) de cada archivo con ast, sin importarlo; la página
+# (y scipy, pandas, etc. que traiga) se importa la primera vez que alguien
+# la visita. dash.page_registry queda completo desde el arranque.
+#
+# El navegador pide la lista de callbacks (/_dash-dependencies) una sola vez
+# por carga, así que con páginas perezosas los enlaces del menú recargan la
+# página (refresh=True): el servidor importa la página antes de responder y
+# el navegador recibe sus callbacks. Eso cuesta en cada cambio de página
+# (se vuelven a bajar los bundles de Dash y se pierde el estado de los
+# controles), así que sólo conviene donde el arranque en frío pesa más que
+# la navegación: por defecto se activa en plataformas serverless y en el
+# resto queda apagado (TM_PAGINAS_PEREZOSAS=1/0 lo fuerza).
+_SERVERLESS = ("AWS_LAMBDA_FUNCTION_NAME", "K_SERVICE", "FUNCTIONS_WORKER_RUNTIME", "VERCEL")
+PEREZOSAS = os.environ.get(
+    "TM_PAGINAS_PEREZOSAS",
+    "1" if any(v in os.environ for v in _SERVERLESS) else "0"
+) == "1"
+
+CARPETA_PAGINAS = Path(__file__).resolve().parent.parent / "pages"
+
+_lock = threading.RLock()
+_paginas = {}        # módulo -> metadatos
+_cargadas = {}       # módulo -> módulo importado
+_salidas = {}        # "id.propiedad" -> módulo que la declara
+_app = None
+
+# plotly serializa con numpy/pandas sólo si ya están en sys.modules, sin
+# importarlos; si el hilo de calentamiento (u otra petición) los está
+# importando, están a medio inicializar. Importarlos de nuevo espera a que
+# terminen (con los módulos ya cargados no cuesta nada)
+_MODULOS_PLOTLY = ("numpy", "pandas")
+
+
+def _llamadas(arbol, nombre):
+    """Nodos Call a `nombre(...)` o `algo.nombre(...)`."""
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Call):
+            funcion = nodo.func
+            if (isinstance(funcion, ast.Name) and funcion.id == nombre) or \
+                    (isinstance(funcion, ast.Attribute) and funcion.attr == nombre):
+                yield nodo
+
+
+def leer_metadatos(archivo):
+    """Argumentos literales del dash.register_page(__name__, ...) del archivo (None si no hay)."""
+    arbol = ast.parse(Path(archivo).read_text(encoding="utf-8"), filename=str(archivo))
+    for nodo in _llamadas(arbol, "register_page"):
+        return {k.arg: ast.literal_eval(k.value) for k in nodo.keywords if k.arg}
+    return None
+
+
+def leer_salidas(archivo):
+    """"id.propiedad" de cada Output("id", "propiedad") con literales del archivo."""
+    arbol = ast.parse(Path(archivo).read_text(encoding="utf-8"), filename=str(archivo))
+    salidas = set()
+    for nodo in _llamadas(arbol, "Output"):
+        if len(nodo.args) >= 2 and all(isinstance(a, ast.Constant) and isinstance(a.value, str)
+                                       for a in nodo.args[:2]):
+            salidas.add(f"{nodo.args[0].value}.{nodo.args[1].value}")
+    return salidas
+
+
+def _modulos_de_output(output):
+    """
+    Páginas que declaran el output de un callback. Dash lo arma como
+    "id.prop" o, si son varios, "..id1.prop1...id2.prop2.."; las salidas
+    con allow_duplicate llevan además "@hash".
+    """
+    partes = output[2:-2].split("...") if output.startswith("..") else [output]
+    return {_salidas[p.split("@")[0]] for p in partes if p.split("@")[0] in _salidas}
+
+
+def _layout_perezoso(modulo):
+    def layout(**kwargs):
+        pagina = cargar(modulo)
+        return pagina.layout(**kwargs) if callable(pagina.layout) else pagina.layout
+    return layout
+
+
+def cargar(modulo):
+    """Importa la página (una sola vez) y pasa sus callbacks a la app."""
+    with _lock:
+        if modulo in _cargadas:
+            return _cargadas[modulo]
+
+        # la página vuelve a llamar a register_page al importarse; ya está
+        # registrada, y dentro de una petición Dash no lo permite
+        token = context_value.set(AttributeDict({**context_value.get(), "ignore_register_page": True}))
+        try:
+            pagina = importlib.import_module(modulo)
+        finally:
+            context_value.reset(token)
+
+        if PEREZOSAS:
+            _incorporar_callbacks()
+        _cargadas[modulo] = pagina
+        return pagina
+
+
+def _incorporar_callbacks():
+    """Lo que Dash hace en el primer request con los @callback globales, para los que llegan después."""
+    if _app is None or not _app._got_first_request["setup_server"]:
+        return  # _setup_server todavía los va a copiar
+
+    for clave in list(_callback.GLOBAL_CALLBACK_MAP):
+        _app.callback_map[clave] = _callback.GLOBAL_CALLBACK_MAP.pop(clave)
+
+    ocultos = _app.config.get("hide_all_callbacks", False)
+    _app._callback_list.extend(
+        {**c, "hidden": ocultos} if c.get("hidden") is None else c
+        for c in _callback.GLOBAL_CALLBACK_LIST
+    )
+    _callback.GLOBAL_CALLBACK_LIST.clear()
+
+
+def pendientes():
+    return [m for m in _paginas if m not in _cargadas]
+
+
+def _modulo_de_ruta(ruta):
+    ruta = _app.strip_relative_path(ruta or "/") or ""
+    for modulo, meta in _paginas.items():
+        if meta["path"].strip("/") == ruta:
+            return modulo
+    return None
+
+
+def _antes():
+    """
+    Importa la página antes de que Dash arme el index o la lista de callbacks
+    (y antes, espera a numpy/pandas si otro hilo los está importando).
+    """
+    for nombre in _MODULOS_PLOTLY:
+        if nombre in sys.modules:
+            importlib.import_module(nombre)
+
+    if request.method == "GET":
+        if request.path.endswith("/_dash-dependencies"):
+            # la pide la página ya cargada: su ruta viene en el Referer
+            modulo = request.referrer and _modulo_de_ruta(urlparse(request.referrer).path)
+        elif "/_dash-" in request.path or "/assets/" in request.path:
+            return
+        else:
+            modulo = _modulo_de_ruta(request.path)
+        if modulo and modulo not in _cargadas:
+            cargar(modulo)
+
+    elif request.path.endswith("/_dash-update-component"):
+        # con varios workers el callback puede llegar a uno que no importó la
+        # página: se importa sólo la que declara ese output (un output
+        # inventado no importa nada)
+        output = (request.get_json(silent=True) or {}).get("output")
+        if isinstance(output, str) and output not in _app.callback_map:
+            for modulo in _modulos_de_output(output):
+                if modulo not in _cargadas:
+                    cargar(modulo)
+
+
+def verificar_dash(app):
+    """RuntimeError si a la app le falta algo de lo que usa _incorporar_callbacks (páginas perezosas)."""
+    faltan = [
+        nombre for nombre, ok in (
+            ("dash._callback.GLOBAL_CALLBACK_MAP", isinstance(getattr(_callback, "GLOBAL_CALLBACK_MAP", None), dict)),
+            ("dash._callback.GLOBAL_CALLBACK_LIST", isinstance(getattr(_callback, "GLOBAL_CALLBACK_LIST", None), list)),
+            ("Dash._got_first_request['setup_server']", "setup_server" in (getattr(app, "_got_first_request", None) or {})),
+            ("Dash._callback_list", isinstance(getattr(app, "_callback_list", None), list)),
+            ("Dash.callback_map", isinstance(getattr(app, "callback_map", None), dict)),
+        ) if not ok
+    ]
+    if faltan:
+        raise RuntimeError(
+            f"utils/paginas.py no es compatible con dash {dash.__version__}: falta "
+            f"{', '.join(faltan)}. Instalar dash>=4.4,<4.5 o usar TM_PAGINAS_PEREZOSAS=0"
+        )
+
+
+def registrar(app, carpeta=CARPETA_PAGINAS):
+    """Registra en dash.page_registry todas las páginas de la carpeta (importándolas sólo si no son perezosas)."""
+    global _app
+    if PEREZOSAS:
+        verificar_dash(app)
+    _app = app
+
+    for archivo in sorted(Path(carpeta).glob("*.py")):
+        if archivo.name.startswith("_"):
+            continue
+        meta = leer_metadatos(archivo)
+        if meta is None:
+            continue
+
+        modulo = f"{Path(carpeta).name}.{archivo.stem}"
+        meta.setdefault("path", "/" + archivo.stem)
+        _paginas[modulo] = meta
+        _salidas.update(dict.fromkeys(leer_salidas(archivo), modulo))
+        dash.register_page(modulo, layout=_layout_perezoso(modulo), **meta)
+
+    if PEREZOSAS:
+        app.server.before_request(_antes)
+    else:
+        for modulo in pendientes():
+            cargar(modulo)
@@ -0,0 +1,109 @@
+# utils/paises.py
+import threading
+import unicodedata
+from collections import namedtuple
+
+from utils.referencia import cargar_referencia
+
+# ============================================================
+# REGISTRO DE PAÍSES (búsqueda O(1) por nombre, ISO2, ISO3 o alias)
+# ============================================================
+# nombre: RESTCountries (clima); nombre_covid: disease.sh (None si no lo publica)
+Pais = namedtuple("Pais", ["nombre", "iso2", "iso3", "lat", "lon", "nombre_covid"])
+
+# Nombres en español y variantes habituales -> ISO2
+ALIAS = {
+    "Estados Unidos": "US", "EEUU": "US", "EE. UU.": "US", "United States of America": "US",
+    "Reino Unido": "GB", "Great Britain": "GB",
+    "Corea del Sur": "KR", "Korea": "KR", "Corea del Norte": "KP",
+    "Emiratos Árabes Unidos": "AE",
+    "Rusia": "RU", "China": "CN", "Japón": "JP", "Alemania": "DE", "Francia": "FR",
+    "España": "ES", "Italia": "IT", "Brasil": "BR", "México": "MX", "Perú": "PE",
+    "Países Bajos": "NL", "Holland": "NL", "Suiza": "CH", "Suecia": "SE",
+    "Congo (Kinshasa)": "CD", "Congo (Brazzaville)": "CG",
+    "Czech Republic": "CZ", "Cote d'Ivoire": "CI", "Swaziland": "SZ",
+    "Macedonia": "MK", "Burma": "MM", "Vatican": "VA",
+}
+
+
+def _clave(texto):
+    """Sin tildes, sin mayúsculas y sin espacios extra ("  Perú " -> "peru")."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.casefold().split())
+
+
+class RegistroPaises:
+    """
+    Índice de la tabla de referencia. Los nombres de RESTCountries y de
+    disease.sh se concilian al construirlo (comparten fila por ISO2), así
+    cualquiera de los dos, los códigos ISO o un alias llevan al mismo país.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        # pandas convierte los None de nombre_covid en NaN
+        self.paises = [
+            Pais(f.nombre, f.iso2, f.iso3, float(f.lat), float(f.lon),
+                 f.nombre_covid if isinstance(f.nombre_covid, str) else None)
+            for f in df.itertuples(index=False)
+        ]
+        self._indice = {}
+
+        por_iso2 = {p.iso2: p for p in self.paises}
+        # el primero en registrar una clave gana: nombres antes que códigos
+        for p in self.paises:
+            self._indice.setdefault(_clave(p.nombre), p)
+        for p in self.paises:
+            if p.nombre_covid:
+                self._indice.setdefault(_clave(p.nombre_covid), p)
+        for alias, iso2 in ALIAS.items():
+            if iso2 in por_iso2:
+                self._indice.setdefault(_clave(alias), por_iso2[iso2])
+        for p in self.paises:
+            self._indice.setdefault(_clave(p.iso3), p)
+            self._indice.setdefault(_clave(p.iso2), p)
+
+        self._tabla = None
+
+    def buscar(self, texto):
+        """Pais o None si no se reconoce."""
+        if texto is None:
+            return None
+        return self._indice.get(_clave(texto))
+
+    def __getitem__(self, texto):
+        pais = self.buscar(texto)
+        if pais is None:
+            raise KeyError(texto)
+        return pais
+
+    def __contains__(self, texto):
+        return self.buscar(texto) is not None
+
+    def __len__(self):
+        return len(self.paises)
+
+    def con_covid(self):
+        """Países publicados por disease.sh, ordenados por nombre."""
+        return [p for p in self.paises if p.nombre_covid]
+
+    def tabla(self):
+        """DataFrame country/lat/lon (nombres de RESTCountries) para el mapa del clima."""
+        if self._tabla is None:
+            self._tabla = self._df[["nombre", "lat", "lon"]].rename(columns={"nombre": "country"})
+        return self._tabla
+
+
+_registro = {"df": None, "registro": None}
+_lock = threading.Lock()
+
+
+def registro():
+    """Registro compartido; se reconstruye sólo si cambia la tabla de referencia."""
+    df = cargar_referencia()
+    with _lock:
+        if _registro["df"] is not df:
+            _registro["registro"] = RegistroPaises(df)
+            _registro["df"] = df
+        return _registro["registro"]
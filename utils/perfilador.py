@@ -0,0 +1,136 @@
+# utils/perfilador.py
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from flask import g, request
+
+# ============================================================
+# PERFILADO BAJO DEMANDA DE CALLBACKS (opcional)
+# ============================================================
+# Se activa por petición de dos formas:
+#   - cabecera X-TM-Perfil igual a TM_PERFIL_TOKEN (sin token no se acepta),
+#   - al azar, con probabilidad TM_PERFIL_MUESTREO (0.01 = 1 % de los callbacks).
+# Sin ninguna de las dos variables los hooks no hacen nada.
+# cProfile mide el hilo del callback; las tareas del pool de APIs
+# (utils/concurrencia) aparecen como espera en Future.result.
+CABECERA = "X-TM-Perfil"
+TOKEN = os.environ.get("TM_PERFIL_TOKEN", "")
+MUESTREO = float(os.environ.get("TM_PERFIL_MUESTREO", 0))
+MAX_PERFILES = int(os.environ.get("TM_PERFIL_MAX", 200))
+
+DIRECTORIO_PERFILES = Path(os.environ.get(
+    "TM_PERFIL_DIR",
+    Path(__file__).resolve().parent.parent / ".cache" / "perfiles"
+))
+
+# sólo un perfil a la vez por proceso (cProfile no admite dos activos)
+_activo = threading.Lock()
+_contador = itertools.count(1)
+
+
+def _pedido():
+    if not (request.method == "POST" and request.path.endswith("/_dash-update-component")):
+        return False
+    if TOKEN and request.headers.get(CABECERA) == TOKEN:
+        return True
+    return MUESTREO > 0 and random.random() < MUESTREO
+
+
+def _antes():
+    if not _pedido() or not _activo.acquire(blocking=False):
+        return
+
+    perfil = cProfile.Profile()
+    try:
+        perfil.enable()
+    except ValueError:
+        # otro perfilador (p. ej. un depurador) ya está activo
+        _activo.release()
+        return
+
+    g.tm_perfil = (perfil, time.perf_counter())
+
+
+def _despues(respuesta):
+    datos = g.pop("tm_perfil", None)
+    if datos is None:
+        return respuesta
+
+    perfil, inicio = datos
+    perfil.disable()
+    segundos = time.perf_counter() - inicio
+    _activo.release()
+
+    try:
+        _guardar(perfil, segundos, respuesta.status_code)
+    except OSError:
+        # sin disco escribible el callback igual responde
+        pass
+
+    return respuesta
+
+
+def _parametros(cuerpo):
+    """{"id.propiedad": valor} de inputs y states (valores largos recortados)."""
+    parametros = {}
+    for grupo in ("inputs", "state"):
+        for item in cuerpo.get(grupo) or []:
+            items = item if isinstance(item, list) else [item]  # ALL/ALLSMALLER
+            for x in items:
+                id_ = x.get("id")
+                if isinstance(id_, dict):  # ids con patrón
+                    id_ = json.dumps(id_, sort_keys=True)
+                valor = json.dumps(x.get("value"), default=str)
+                parametros[f"{id_}.{x.get('property')}"] = valor if len(valor) <= 300 else valor[:300] + "..."
+    return parametros
+
+
+def _guardar(perfil, segundos, estado):
+    cuerpo = request.get_json(silent=True) or {}
+    output = str(cuerpo.get("output", "desconocido"))
+
+    nombre = re.sub(r"[^A-Za-z0-9_-]+", "_", output).strip("_")[:80] or "callback"
+    base = DIRECTORIO_PERFILES / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_contador)}-{nombre}"
+    DIRECTORIO_PERFILES.mkdir(parents=True, exist_ok=True)
+
+    # .prof: se abre con pstats, snakeviz, etc.
+    perfil.dump_stats(f"{base}.prof")
+
+    resumen = io.StringIO()
+    pstats.Stats(perfil, stream=resumen).sort_stats("cumulative").print_stats(25)
+
+    Path(f"{base}.json").write_text(json.dumps({
+        "output": output,
+        "disparado_por": "cabecera" if TOKEN and request.headers.get(CABECERA) == TOKEN else "muestreo",
+        "segundos": round(segundos, 6),
+        "estado_http": estado,
+        "parametros": _parametros(cuerpo),
+        "resumen": resumen.getvalue()
+    }, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    _recortar()
+
+
+def _recortar():
+    """Conserva sólo los MAX_PERFILES más recientes."""
+    perfiles = sorted(DIRECTORIO_PERFILES.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+    for viejo in perfiles[:-MAX_PERFILES] if MAX_PERFILES > 0 else []:
+        viejo.unlink(missing_ok=True)
+        viejo.with_suffix(".json").unlink(missing_ok=True)
+
+
+def registrar(server):
+    """Engancha el perfilado a las peticiones de callbacks (no hace nada si no está configurado)."""
+    if not TOKEN and MUESTREO <= 0:
+        return
+    server.before_request(_antes)
+    server.after_request(_despues)
@@ -0,0 +1,126 @@
+# utils/referencia.py
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import http
+
+# ============================================================
+# TABLA DE PAÍSES INCLUIDA CON LA APP
+# ============================================================
+# data/paises.json viene en el repositorio (RESTCountries + disease.sh),
+# así el arranque no depende de ninguna API. Formato columnar:
+# {"version", "generado", "fuentes", "columnas": {col: [valores...]}}
+VERSION_REFERENCIA = 1
+
+_RAIZ = Path(__file__).resolve().parent.parent
+RUTA_INCLUIDA = _RAIZ / "data" / "paises.json"
+# copia renovada desde la red (opcional, ver actualizar_referencia)
+RUTA_ACTUALIZADA = Path(os.environ.get(
+    "TM_PAISES_JSON",
+    _RAIZ / ".cache" / "paises.json"
+))
+
+COLUMNAS = ["nombre", "iso2", "iso3", "lat", "lon", "nombre_covid"]
+
+_referencia = {"df": None}
+_lock = threading.Lock()
+
+
+def _leer(ruta):
+    datos = json.loads(ruta.read_text(encoding="utf-8"))
+    if datos.get("version") != VERSION_REFERENCIA:
+        raise ValueError(f"{ruta}: versión {datos.get('version')} (se espera {VERSION_REFERENCIA})")
+
+    columnas = datos["columnas"]
+    # float32 basta para centroides (el clima redondea a 0.1°)
+    return pd.DataFrame({
+        "nombre": columnas["nombre"],
+        "iso2": columnas["iso2"],
+        "iso3": columnas["iso3"],
+        "lat": np.asarray(columnas["lat"], dtype=np.float32),
+        "lon": np.asarray(columnas["lon"], dtype=np.float32),
+        "nombre_covid": columnas["nombre_covid"],
+    })
+
+
+def cargar_referencia():
+    """
+    DataFrame con una fila por país: nombre (RESTCountries), iso2, iso3,
+    lat, lon y nombre_covid (disease.sh; None si no lo publica).
+    Usa la copia renovada si existe y es válida; si no, la incluida.
+    """
+    df = _referencia["df"]
+    if df is not None:
+        return df
+
+    with _lock:
+        if _referencia["df"] is None:
+            try:
+                _referencia["df"] = _leer(RUTA_ACTUALIZADA)
+            except (OSError, ValueError, KeyError):
+                _referencia["df"] = _leer(RUTA_INCLUIDA)
+        return _referencia["df"]
+
+
+# ============================================================
+# RENOVACIÓN DESDE LAS APIs (opcional, en segundo plano)
+# ============================================================
+def _descargar_referencia():
+    r = http.get(
+        "restcountries",
+        f"{http.RESTCOUNTRIES_URL}/v3.1/all?fields=name,cca2,cca3,latlng"
+    )
+    r.raise_for_status()
+
+    r_covid = http.get("covid-paises", f"{http.DISEASE_SH_URL}/v3/covid-19/countries")
+    r_covid.raise_for_status()
+
+    # disease.sh nombra distinto ("USA", "S. Korea"...): se cruza por ISO2
+    covid_por_iso2 = {
+        c["countryInfo"]["iso2"]: c["country"]
+        for c in r_covid.json()
+        if c.get("countryInfo", {}).get("iso2")
+    }
+
+    filas = sorted(
+        (c["name"]["common"], c["cca2"], c["cca3"], c["latlng"][0], c["latlng"][1],
+         covid_por_iso2.get(c["cca2"]))
+        for c in r.json()
+        if c.get("cca2") and len(c.get("latlng", [])) >= 2
+    )
+    if not filas:
+        raise ValueError("RESTCountries no devolvió países")
+
+    return {
+        "version": VERSION_REFERENCIA,
+        "generado": pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%d"),
+        "fuentes": {
+            "nombre": "restcountries v3.1 (name.common)",
+            "lat/lon": "restcountries v3.1 (latlng)",
+            "nombre_covid": "disease.sh v3 /covid-19/countries (country)"
+        },
+        "columnas": {col: list(valores) for col, valores in zip(COLUMNAS, zip(*filas))}
+    }
+
+
+def actualizar_referencia():
+    """
+    Descarga ambas tablas, las guarda en RUTA_ACTUALIZADA (escritura atómica)
+    y reemplaza la referencia en memoria. Los errores de red se propagan.
+    """
+    datos = _descargar_referencia()
+
+    RUTA_ACTUALIZADA.parent.mkdir(parents=True, exist_ok=True)
+    temporal = RUTA_ACTUALIZADA.with_suffix(f".{os.getpid()}.tmp")
+    temporal.write_text(json.dumps(datos, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(temporal, RUTA_ACTUALIZADA)
+
+    df = _leer(RUTA_ACTUALIZADA)
+    with _lock:
+        _referencia["df"] = df
+    return df
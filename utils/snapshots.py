@@ -0,0 +1,109 @@
+# utils/snapshots.py
+import hashlib
+import json
+import os
+import sys
+import threading
+import types
+from pathlib import Path
+
+import plotly
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+from utils.compacto import COMPACTAR, compactar_figura
+
+# Subir este número invalida todos los snapshots (el código de las páginas ya entra en la clave)
+VERSION_SNAPSHOT = 3
+
+DIRECTORIO_SNAPSHOTS = Path(os.environ.get(
+    "TM_SNAPSHOT_DIR",
+    Path(__file__).resolve().parent.parent / ".cache" / "figuras"
+))
+
+_memoria = {}
+_huellas = {}
+_lock = threading.Lock()
+
+
+def huella_codigo(construir):
+    """
+    Hash del código fuente del módulo donde está construir() y de los módulos
+    utils.* que ese módulo usa (modelos, estilos...), más la versión de plotly.
+    Editar constantes, tiempos o estilo de una página cambia la clave sola.
+    """
+    nombre = construir.__module__
+    if nombre in _huellas:
+        return _huellas[nombre]
+
+    modulo = sys.modules[nombre]
+    rutas = {modulo.__file__}
+    for valor in vars(modulo).values():
+        usado = valor if isinstance(valor, types.ModuleType) else sys.modules.get(getattr(valor, "__module__", None) or "")
+        if usado is not None and usado.__name__.startswith("utils.") and getattr(usado, "__file__", None):
+            rutas.add(usado.__file__)
+
+    h = hashlib.sha256(plotly.__version__.encode("utf-8"))
+    for ruta in sorted(rutas):
+        h.update(Path(ruta).read_bytes())
+
+    _huellas[nombre] = h.hexdigest()[:16]
+    return _huellas[nombre]
+
+
+def clave_parametros(nombre, construir, parametros=None):
+    """Hash estable de página + código + parámetros (orden de claves irrelevante)."""
+    texto = json.dumps(
+        {"pagina": nombre, "version": VERSION_SNAPSHOT, "compacto": COMPACTAR,
+         "codigo": huella_codigo(construir), "parametros": parametros},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def snapshot(nombre, construir, parametros=None):
+    """
+    Devuelve el resultado de construir() (figuras y valores) como JSON ya parseado.
+
+    Orden de búsqueda: memoria del proceso -> archivo en disco -> construir().
+    Así las páginas estáticas sólo integran sus EDO la primera vez que
+    alguien las visita, y no al importar el módulo. La clave incluye el código
+    de la página (huella_codigo): no hace falta repetir sus constantes en
+    `parametros`, que queda para valores que no están en el código.
+    """
+    ruta = DIRECTORIO_SNAPSHOTS / f"{nombre}-{clave_parametros(nombre, construir, parametros)}.json"
+
+    datos = _memoria.get(ruta)
+    if datos is not None:
+        return datos
+
+    with _lock:
+        datos = _memoria.get(ruta)
+        if datos is not None:
+            return datos
+
+        try:
+            datos = json.loads(ruta.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = to_json_plotly({
+                clave: compactar_figura(valor) if isinstance(valor, go.Figure) else valor
+                for clave, valor in construir().items()
+            })
+            datos = json.loads(payload)
+            _guardar(ruta, payload)
+
+        _memoria[ruta] = datos
+        return datos
+
+
+def _guardar(ruta, payload):
+    """Escritura atómica: otros workers nunca leen un archivo a medias."""
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        temporal = ruta.with_suffix(f".{os.getpid()}.tmp")
+        temporal.write_text(payload, encoding="utf-8")
+        os.replace(temporal, ruta)
+    except OSError:
+        # sin disco escribible seguimos funcionando sólo con la memoria
+        pass